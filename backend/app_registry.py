@@ -0,0 +1,111 @@
+import ast
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+APPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "applications")
+
+# Top-level imports that mean an app drives the Pi hardware (backend.hal included;
+# off the Pi it falls back to simulation, but on it the app owns real pins)
+HARDWARE_MODULES = ("RPi", "gpiozero", "pigpio", "smbus", "smbus2", "spidev", "board", "busio", "serial",
+                    "backend.hal")
+
+
+@dataclass
+class AppInfo:
+    name: str                 # file name, e.g. 'oregon_trail.py'
+    path: str                 # absolute path
+    doc: str                  # first paragraph of the module docstring ('' if none)
+    entry_point: Optional[str]  # 'main' if the module defines main(), '__main__' if only a main guard
+    needs_hardware: bool
+    mtime: float
+
+    @property
+    def title(self) -> str:
+        return self.doc.splitlines()[0] if self.doc else self.name[:-3].replace("_", " ")
+
+
+def _is_hardware(module: str) -> bool:
+    return any(module == m or module.startswith(m + ".") for m in HARDWARE_MODULES)
+
+
+def _inspect(path: str, mtime: float) -> AppInfo:
+    """Reads metadata from the source with ast; the app is never imported."""
+    name = os.path.basename(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return AppInfo(name, path, "", None, False, mtime)
+
+    doc = (ast.get_docstring(tree) or "").strip().split("\n\n")[0]
+    entry_point = None
+    needs_hardware = False
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "main":
+            entry_point = "main"
+        elif isinstance(node, ast.If) and entry_point is None and "__main__" in ast.dump(node.test):
+            entry_point = "__main__"
+        elif isinstance(node, ast.Import):
+            needs_hardware |= any(_is_hardware(a.name) for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            # 'from backend import hal' counts as well as 'from backend.hal import ...'
+            needs_hardware |= any(_is_hardware(f"{node.module}.{a.name}") for a in node.names)
+    return AppInfo(name, path, doc, entry_point, needs_hardware, mtime)
+
+
+class AppRegistry:
+    """
+    Index of backend/applications/. Built once and rebuilt only when the
+    directory or one of the app files changes mtime.
+    """
+
+    def __init__(self, apps_dir: str = APPS_DIR):
+        self.apps_dir = apps_dir
+        self._apps: Dict[str, AppInfo] = {}
+        self._signature: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+    def _current_signature(self) -> Tuple:
+        # One stat per file; far cheaper than re-parsing every app
+        try:
+            dir_mtime = os.stat(self.apps_dir).st_mtime_ns
+            files = tuple(sorted(
+                (e.name, e.stat().st_mtime_ns)
+                for e in os.scandir(self.apps_dir)
+                if e.name.endswith(".py") and e.is_file()
+            ))
+        except FileNotFoundError:
+            return ()
+        return (dir_mtime, files)
+
+    def apps(self) -> Dict[str, AppInfo]:
+        """name -> AppInfo, refreshed only if something changed on disk."""
+        signature = self._current_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._rebuild(signature)
+        return self._apps
+
+    def _rebuild(self, signature: Tuple) -> None:
+        apps = {}
+        for name, mtime_ns in (signature[1] if signature else ()):
+            old = self._apps.get(name)
+            mtime = mtime_ns / 1e9
+            if old is not None and old.mtime == mtime:
+                apps[name] = old  # unchanged file, keep its parsed metadata
+            else:
+                apps[name] = _inspect(os.path.join(self.apps_dir, name), mtime)
+        self._apps = apps
+        self._signature = signature
+
+    def names(self) -> List[str]:
+        return sorted(self.apps())
+
+    def get(self, name: str) -> Optional[AppInfo]:
+        return self.apps().get(name)
+
+
+registry = AppRegistry()
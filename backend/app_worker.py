@@ -0,0 +1,42 @@
+"""
+Warm interpreter used by backend/launcher.py.
+
+Imports the modules our apps commonly need up front, then waits on stdin for
+the absolute path of the app to run. Whatever is left on stdin afterwards is
+the app's own input.
+"""
+import importlib
+import os
+import runpy
+import sys
+
+PRELOAD = (
+    "random", "textwrap", "dataclasses", "datetime", "typing", "json", "time",
+    "shlex", "math", "requests", "dotenv",
+)
+
+
+def preload():
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def main():
+    preload()
+    line = sys.stdin.readline()
+    if not line.strip():
+        return
+    path = line.strip()
+    app_dir = os.path.dirname(path)
+    # Look like 'python3 <path>' run from the app's own folder
+    sys.argv = [path]
+    sys.path.insert(0, app_dir)
+    os.chdir(app_dir)
+    runpy.run_path(path, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,46 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 import time
 
-GPIO.setmode(GPIO.BCM)
+# Allow 'python3 applications/ultrasonic.py' to find the backend package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.hal import make_backend, RangingError
+from backend.hal.ranging import open_rangefinder
 
 TRIG = 23
 ECHO = 24
 
-GPIO.setup(TRIG, GPIO.OUT)
-GPIO.setup(ECHO, GPIO.IN)
 
-def get_distance():
-    GPIO.output(TRIG, True)
-    time.sleep(0.00001)
-    GPIO.output(TRIG, False)
+def setup(backend):
+    """Rangefinder on TRIG/ECHO; off the Pi a simulated sensor answers instead."""
+    return open_rangefinder(backend, TRIG, ECHO)
 
-    while GPIO.input(ECHO) == 0:
-        start = time.time()
 
-    while GPIO.input(ECHO) == 1:
-        end = time.time()
+def get_distance(ranger):
+    """Distance in cm, or None if the measurement failed (the reason is printed)."""
+    try:
+        return ranger.measure()
+    except RangingError as e:
+        print(f"Measurement failed: {e}")
+        return None
 
-    duration = end - start
-    distance = (duration * 34300) / 2
-    return distance
 
-try:
-    while True:
-        print(f"Distance: {get_distance():.2f} cm")
-        time.sleep(0.5)
+def main():
+    backend = make_backend()
+    ranger = setup(backend)
+    try:
+        while True:
+            distance = get_distance(ranger)
+            if distance is not None:
+                print(f"Distance: {distance:.2f} cm")
+            time.sleep(0.5)
 
-except KeyboardInterrupt:
-    GPIO.cleanup()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ranger.close()
+        backend.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,382 @@
+import contextlib
+import json
 import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv("../.env")  # load variables from .env file
 
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
-BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
+BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "http://api.openweathermap.org/data/2.5/weather")
+TIMEOUT = (3.05, 5)  # (connect, read) seconds
+CACHE_PATH = os.getenv("WEATHER_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "pipboy", "weather.sqlite3"))
+CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+
+
+class WeatherError(Exception):
+    pass
+
+
+class WeatherClient:
+    """
+    Pooled OpenWeatherMap client.
+
+    One requests.Session keeps connections alive between calls, every request has
+    strict connect/read timeouts, transient 5xx answers are retried, and ETag /
+    Last-Modified validators are sent back so an unchanged reading costs a 304.
+    fetch_many() fetches several cities concurrently over the same pool.
+    """
+
+    def __init__(self, base_url=BASE_URL, api_key=API_KEY, timeout=TIMEOUT, pool_size=8, retries=2):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, connect=retries, read=0, backoff_factor=0.3,
+                              status_forcelist=(502, 503, 504), allowed_methods=("GET",)),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._validators = {}  # (city, units) -> (headers for the next request, last result)
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def fetch(self, city_name, units="metric"):
+        """Same result as fetch_weather(), through the pool."""
+        key = (city_name.lower(), units)
+        with self._lock:
+            headers, cached = self._validators.get(key, ({}, None))
+        params = {"q": city_name, "appid": self.api_key, "units": units}
+        try:
+            resp = self.session.get(self.base_url, params=params, headers=headers, timeout=self.timeout)
+            if resp.status_code == 304 and cached is not None:
+                self.not_modified += 1
+                return dict(cached, fetched_at=time.time())
+            data = resp.json()
+        except (requests.RequestException, ValueError) as e:
+            raise WeatherError(f"request failed: {e}") from e
+        if resp.status_code != 200:
+            raise WeatherError(data.get("message") or f"HTTP {resp.status_code}")
+        weather = _parse(city_name, units, data)
+
+        validators = {}
+        if resp.headers.get("ETag"):
+            validators["If-None-Match"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        with self._lock:
+            self._validators[key] = (validators, weather)
+        return weather
+
+    def fetch_many(self, cities, units="metric", max_workers=None):
+        """{city: weather dict or WeatherError} for every city, fetched concurrently."""
+        cities = list(cities)
+        if not cities:
+            return {}
+
+        def one(city):
+            try:
+                return self.fetch(city, units)
+            except WeatherError as e:
+                return e
+
+        workers = max_workers or min(self.pool_size, len(cities))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(cities, pool.map(one, cities)))
+
+    def close(self):
+        self.session.close()
+
+
+def _parse(city_name, units, data):
+    try:
+        return {
+            "city": city_name,
+            "description": data["weather"][0]["description"],
+            "temp": data["main"]["temp"],
+            "feels_like": data["main"].get("feels_like"),
+            "humidity": data["main"].get("humidity"),
+            "units": units,
+            "fetched_at": time.time(),
+        }
+    except (KeyError, IndexError, TypeError) as e:
+        raise WeatherError(f"unexpected response: {e}") from e
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide WeatherClient so every caller shares one connection pool."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = WeatherClient()
+    return _client
+
+
+def fetch_weather(city_name, units="metric"):
+    """
+    Current weather for a city as a plain dict:
+    {"city", "description", "temp", "feels_like", "humidity", "units", "fetched_at"}.
+    Raises WeatherError on any network or API failure.
+    """
+    return get_client().fetch(city_name, units)
+
+
+class WeatherCache:
+    """
+    Stale-while-revalidate weather cache on disk, shared by every process.
+
+    get() answers from the cache right away; a fresh entry is returned as is, a
+    stale one is returned with "stale": True while one background refresh runs.
+    SQLite (WAL) makes concurrent readers/writers across processes safe, and a
+    lease column makes sure only one process refreshes a given city at a time.
+    """
+
+    LEASE_SECONDS = 30
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, fetch=None):
+        self.path = path
+        self.ttl = ttl
+        self.fetch = fetch or fetch_weather
+        self._refreshing = {}  # key -> Thread, within this process
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS weather ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " refresh_until REAL NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe from any thread
+        db = sqlite3.connect(self.path, timeout=5.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # sqlite3's own context manager commits but never closes; this does both
+        with contextlib.closing(self._connect()) as db:
+            with db:
+                yield db
+
+    @staticmethod
+    def _key(city_name, units):
+        return f"{city_name.strip().lower()}|{units}"
+
+    def peek(self, city_name, units="metric"):
+        """Cached reading (with 'age' and 'stale' filled in) or None; never fetches."""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT value, fetched_at FROM weather WHERE key = ?",
+                             (self._key(city_name, units),)).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        weather = json.loads(row[0])
+        age = time.time() - row[1]
+        return dict(weather, age=age, stale=age > self.ttl)
+
+    def put(self, city_name, units, weather):
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO weather (key, value, fetched_at, refresh_until) VALUES (?, ?, ?, 0)",
+                (self._key(city_name, units), json.dumps(weather), weather.get("fetched_at", time.time())),
+            )
+
+    def _take_lease(self, key):
+        now = time.time()
+        with self._transaction() as db:
+            cur = db.execute("UPDATE weather SET refresh_until = ? WHERE key = ? AND refresh_until < ?",
+                             (now + self.LEASE_SECONDS, key, now))
+            return cur.rowcount == 1
+
+    def get(self, city_name, units="metric", on_refresh=None, on_error=None):
+        """
+        Fresh or stale reading immediately; fetches synchronously only on a cold miss
+        (raising WeatherError if that fails). on_refresh/on_error report the outcome
+        of a background refresh.
+        """
+        cached = self.peek(city_name, units)
+        if cached is None:
+            weather = self.fetch(city_name, units)
+            self.put(city_name, units, weather)
+            return dict(weather, age=0.0, stale=False)
+        if cached["stale"]:
+            self._refresh_in_background(city_name, units, on_refresh, on_error)
+        return cached
+
+    def _refresh_in_background(self, city_name, units, on_refresh, on_error):
+        key = self._key(city_name, units)
+        with self._lock:
+            running = self._refreshing.get(key)
+            if running is not None and running.is_alive():
+                return
+            if not self._take_lease(key):
+                return  # another process is already on it
+
+            def refresh():
+                try:
+                    weather = self.fetch(city_name, units)
+                except WeatherError as e:
+                    with self._transaction() as db:  # release the lease so someone can retry
+                        db.execute("UPDATE weather SET refresh_until = 0 WHERE key = ?", (key,))
+                    if on_error is not None:
+                        on_error(str(e))
+                    return
+                self.put(city_name, units, weather)
+                if on_refresh is not None:
+                    on_refresh(dict(weather, age=0.0, stale=False))
+
+            thread = threading.Thread(target=refresh, name=f"weather-refresh-{key}", daemon=True)
+            self._refreshing[key] = thread
+            thread.start()
+
+    def wait_for_refresh(self, timeout=None):
+        """Blocks until background refreshes started by this process finish."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+
+_cache = None
+
+
+def get_cache():
+    """Process-wide WeatherCache at CACHE_PATH."""
+    global _cache
+    if _cache is None:
+        with _client_lock:
+            if _cache is None:
+                _cache = WeatherCache()
+    return _cache
+
 
 def get_weather(city_name):
-    params = {"q": city_name, "appid": API_KEY, "units": "metric"}
-    resp = requests.get(BASE_URL, params=params)
-    data = resp.json()
-    if resp.status_code != 200:
-        print(f"Error: {data.get('message')}")
-        return
-    weather = data["weather"][0]["description"]
-    temp = data["main"]["temp"]
-    print(f"Weather in {city_name}: {weather}, {temp}°C")
+    """Prints the current weather and returns it (None on error). Served from the shared cache."""
+    cache = get_cache()
+    try:
+        weather = cache.get(city_name)
+    except WeatherError as e:
+        print(f"Error: {e}")
+        return None
+    note = f" (cached {weather['age'] / 60:.0f} min ago)" if weather["stale"] else ""
+    print(f"Weather in {city_name}: {weather['description']}, {weather['temp']}°C{note}")
+    # Let a started refresh land in the cache before a CLI process exits
+    cache.wait_for_refresh(TIMEOUT[0] + TIMEOUT[1])
+    return weather
+
+
+class WeatherService:
+    """
+    Refreshes the weather for one city on a background thread.
+
+    Successful fetches repeat every `interval` seconds (+/- `jitter` fraction so
+    devices don't hit the API in lockstep). Failures retry with exponential
+    backoff up to `max_backoff`. Callbacks run on the service thread.
+    """
+
+    def __init__(self, city_name, on_update, on_error=None, units="metric",
+                 interval=None, jitter=0.1, min_backoff=5.0, max_backoff=600.0, cache=None):
+        self.city_name = city_name
+        self.cache = cache
+        self.units = units
+        self.on_update = on_update
+        self.on_error = on_error
+        self.interval = interval if interval is not None else float(os.getenv("WEATHER_REFRESH_SECONDS", "900"))
+        self.jitter = jitter
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.last = None
+        self.retry_in = None  # set when someone else is refreshing; check back sooner than interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self):
+        """Seconds until the next fetch, given the current failure count."""
+        if self.failures:
+            base = min(self.max_backoff, self.min_backoff * 2 ** (self.failures - 1))
+        elif self.retry_in is not None:
+            base = self.retry_in
+        else:
+            base = self.interval
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _updated(self, weather):
+        self.failures = 0
+        self.last = weather
+        self.on_update(weather)
+
+    def _failed(self, message):
+        self.failures += 1
+        if self.on_error is not None:
+            self.on_error(message)
+
+    def refresh(self):
+        """
+        One update. Shows the cached reading at once (even if stale), then waits
+        for the revalidation so the failure count is right for next_delay().
+        """
+        cache = self.cache or get_cache()
+        self.retry_in = None
+        try:
+            weather = cache.get(self.city_name, self.units, on_refresh=self._updated, on_error=self._failed)
+        except WeatherError as e:
+            self._failed(str(e))
+            return None
+        if weather["stale"]:
+            # Show the old reading now; _updated fires again when the refresh lands
+            self.last = weather
+            self.on_update(weather)
+            cache.wait_for_refresh(TIMEOUT[0] + TIMEOUT[1] + 1)
+            if not self.failures:
+                latest = cache.peek(self.city_name, self.units)
+                if latest is not None and latest["stale"]:
+                    # Nobody here refreshed it: another process holds the lease. Look again
+                    # once that runs out instead of sitting on stale data for a whole interval
+                    self.retry_in = cache.LEASE_SECONDS
+                elif latest is not None and latest["fetched_at"] != self.last.get("fetched_at"):
+                    self._updated(latest)  # another process's refresh landed meanwhile
+        else:
+            self._updated(weather)
+        return self.last
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.next_delay())
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="weather", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
 
 if __name__ == "__main__":
     city = input("Enter city name: ")
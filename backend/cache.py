@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "completions.sqlite3")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """'  Run   Oregon Trail!! ' and 'run oregon trail' should share a cache entry."""
+    text = re.sub(r"\s+", " ", prompt.strip().lower())
+    return text.rstrip(" .!?")
+
+
+def make_key(kind: str, prompt: str, model: str, system_prompt: str,
+             memory: Optional[List[Dict[str, str]]] = None) -> str:
+    """sha256 over everything that can change the answer."""
+    payload = json.dumps(
+        [kind, normalize_prompt(prompt), model, system_prompt, memory or []],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    SQLite-backed LRU/TTL cache for chatbot completions.
+
+    Every entry has its own expiry. The least recently used entries are evicted
+    once the cache holds more than `max_entries` rows or `max_bytes` of values.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = 2000,
+                 max_bytes: int = 4 * 1024 * 1024, default_ttl: float = 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_lru ON completions(last_used)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        expires = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, expires, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM completions WHERE expires < ?", (now,))
+        count, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        # Walk from least recently used until both caps are met
+        doomed = []
+        for key, entry_size in self._db.execute(
+            "SELECT key, size FROM completions ORDER BY last_used ASC"
+        ).fetchall():
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            size -= entry_size
+        self._db.executemany("DELETE FROM completions WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
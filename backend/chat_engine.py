@@ -0,0 +1,99 @@
+import asyncio
+import backend.chatbot as chatbot
+import backend.emotion_local as emotion_local
+import backend.input as chat_input
+from backend.memory import ConversationMemory
+from typing import Callable, List, Optional
+
+# Reclassify the reply once this many new characters have arrived at a sentence end
+CHUNK_CHARS = 60
+SENTENCE_ENDS = (".", "!", "?", "\n")
+
+
+class AsyncChatEngine:
+    """
+    asyncio version of the input.py turn pipeline, sharing its memory by default.
+
+    - the user's prompt is classified before the reply starts generating,
+      so the face has an emotion before the first token lands
+    - the reply is reclassified chunk by chunk as it streams in; these guesses
+      use the local model only
+    - at most one remote emotion call per turn, on the final reply, and only
+      when the local model isn't confident
+    - submit() cancels whatever turn is still in flight
+    """
+
+    def __init__(self, client=None, memory: Optional[ConversationMemory] = None):
+        self.client = client or chatbot.get_async_client()
+        self.memory = memory or chat_input.memory
+        self._current: Optional[asyncio.Task] = None
+
+    def submit(self, prompt: str,
+               on_token: Optional[Callable[[str], None]] = None,
+               on_emotion: Optional[Callable[[str], None]] = None) -> asyncio.Task:
+        """Starts a turn, cancelling the previous one if it hasn't finished."""
+        self.cancel()
+        self._current = asyncio.create_task(self.turn(prompt, on_token, on_emotion))
+        return self._current
+
+    def cancel(self) -> bool:
+        """Cancels the in-flight turn. Returns True if there was one."""
+        if self._current is not None and not self._current.done():
+            self._current.cancel()
+            return True
+        return False
+
+    async def turn(self, prompt: str,
+                   on_token: Optional[Callable[[str], None]] = None,
+                   on_emotion: Optional[Callable[[str], None]] = None) -> List[str]:
+        """Runs one turn and returns [resp, emo] like input.user_prompt."""
+        prompt = prompt.strip()
+        emo: Optional[str] = None
+
+        def report(label: str) -> None:
+            nonlocal emo
+            if label in chatbot.EMOTIONS and label != emo:
+                emo = label
+                if on_emotion is not None:
+                    on_emotion(emo)
+
+        report(emotion_local.classify(prompt)[0])
+
+        parts: List[str] = []
+        classified_len = 0
+        async for tok in chatbot.aresponse_stream(self.client, prompt, self.memory.messages()):
+            parts.append(tok)
+            if on_token is not None:
+                on_token(tok)
+            text = "".join(parts)
+            if len(text) - classified_len >= CHUNK_CHARS and text.rstrip().endswith(SENTENCE_ENDS):
+                classified_len = len(text)
+                report(emotion_local.classify(text)[0])
+
+        resp = "".join(parts).strip()
+        if resp:
+            # The only call that may go remote, once per turn
+            report(await chatbot.aemotion(self.client, resp))
+        emo = emo or "Happy"
+
+        print(f"[emotion: {emo}]")
+        # Summarizing may hit the network; keep it off the event loop
+        await asyncio.to_thread(self.memory.add_turn, prompt, resp)
+        return [resp, emo]
+
+
+async def _demo():
+    engine = AsyncChatEngine()
+    while True:
+        prompt = await asyncio.to_thread(input, "> ")
+        if prompt.strip().lower() == "stop":
+            break
+        resp, emo, apps = await chat_input.user_prompt_async(
+            engine, prompt, on_token=lambda t: print(t, end="", flush=True))
+        print(f"\n[{emo}]")
+        if apps:
+            print(f"[apps: {', '.join(apps)}]")
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
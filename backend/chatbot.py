@@ -1,26 +1,169 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, BadRequestError
 from dotenv import load_dotenv
+import atexit
+import httpx
+import importlib.util
+import json
 import os
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Callable, Iterator, AsyncIterator
+from backend.cache import CompletionCache, make_key
+import backend.emotion_local as emotion_local
+import backend.app_registry as app_registry
 
-def loadAI() -> OpenAI:
+MODEL = "google/gemini-2.5-flash-lite"
+EMOTIONS = emotion_local.LABELS
+# Below this local classifier confidence, emotion() asks the LLM instead
+LOCAL_EMOTION_CONFIDENCE = 0.6
+EMOTION_TAG = "EMOTION:"  # first line of a tagged streaming reply, see turn_stream()
+
+# JSON schema for the combined reply/emotion/app completion
+TURN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "reply": {"type": "string"},
+        "emotion": {"type": "string", "enum": list(EMOTIONS)},
+        "app": {"type": ["string", "null"]},
+    },
+    "required": ["reply", "emotion", "app"],
+    "additionalProperties": False,
+}
+
+# Cache entry lifetimes
+RESPONSE_TTL = 24 * 3600
+EMOTION_TTL = 30 * 24 * 3600
+
+_client: OpenAI | None = None
+_async_client: AsyncOpenAI | None = None
+_cache: CompletionCache | None = None
+_client_lock = threading.Lock()
+
+
+def _pool_options(max_connections: int | None, max_keepalive: int | None, keepalive_expiry: float | None) -> Dict[str, Any]:
+    # Call after load_dotenv() so .env overrides apply
+    if max_connections is None:
+        max_connections = int(os.environ.get("CHATBOT_MAX_CONNECTIONS", "4"))
+    if max_keepalive is None:
+        max_keepalive = int(os.environ.get("CHATBOT_MAX_KEEPALIVE", "2"))
+    if keepalive_expiry is None:
+        keepalive_expiry = float(os.environ.get("CHATBOT_KEEPALIVE_EXPIRY", "120"))
+    # HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+    http2 = os.environ.get("CHATBOT_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(60.0, connect=10.0),
+    }
+
+
+def loadAI(
+    max_connections: int | None = None,
+    max_keepalive: int | None = None,
+    keepalive_expiry: float | None = None,
+) -> OpenAI:
     """
-    Loads environment variables and returns an OpenRouter-compatible OpenAI client.
-    Requires OPENROUTER_API_KEY to be set.
+    Loads environment variables and returns a NEW OpenRouter-compatible OpenAI client.
+    Requires OPENROUTER_API_KEY to be set. Use get_client() for the shared one.
+    Pool limits default to CHATBOT_MAX_CONNECTIONS / CHATBOT_MAX_KEEPALIVE /
+    CHATBOT_KEEPALIVE_EXPIRY; CHATBOT_HTTP2=0 turns HTTP/2 off.
     """
     load_dotenv()
     client = OpenAI(
         base_url="https://openrouter.ai/api/v1",
         api_key=os.environ["OPENROUTER_API_KEY"],
+        http_client=httpx.Client(**_pool_options(max_connections, max_keepalive, keepalive_expiry)),
     )
     return client
 
 
+def loadAsyncAI(
+    max_connections: int | None = None,
+    max_keepalive: int | None = None,
+    keepalive_expiry: float | None = None,
+) -> AsyncOpenAI:
+    """
+    Async twin of loadAI(). The pool belongs to the event loop it is first used on.
+    """
+    load_dotenv()
+    return AsyncOpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=os.environ["OPENROUTER_API_KEY"],
+        http_client=httpx.AsyncClient(**_pool_options(max_connections, max_keepalive, keepalive_expiry)),
+    )
+
+
+def get_client() -> OpenAI:
+    """
+    Process-wide client. Built once, so every turn reuses the same keep-alive pool.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = loadAI()
+                atexit.register(close_client)
+    return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client, same idea as get_client()."""
+    global _async_client
+    if _async_client is None:
+        _async_client = loadAsyncAI()
+    return _async_client
+
+
+def get_cache() -> CompletionCache | None:
+    """Shared completion cache, or None when CHATBOT_CACHE=0."""
+    global _cache
+    if os.environ.get("CHATBOT_CACHE", "1") == "0":
+        return None
+    if _cache is None:
+        with _client_lock:
+            if _cache is None:
+                _cache = CompletionCache()
+    return _cache
 
-def emotion(client: OpenAI, text: str) -> str:
+
+def _cache_key(kind: str, messages: List[Dict[str, str]]) -> str:
+    # system prompt + everything sent in between (summary and all history) + the new prompt,
+    # so only a turn with exactly the same context can replay an answer
+    return make_key(kind, messages[-1]["content"], MODEL, messages[0]["content"], messages[1:-1])
+
+
+def close_client() -> None:
+    """Closes the shared client and its connection pool."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def warm_up(background: bool = True) -> threading.Thread | None:
     """
-    Classifies emotion. Uses single-token-ish labels to honor 'single word ONLY'.
+    Opens the pooled connection (DNS + TCP + TLS) ahead of the first chat turn.
     """
+    def _warm():
+        try:
+            get_client().with_options(timeout=10.0, max_retries=0).models.list()
+        except Exception as e:
+            print(f"[chatbot warm-up failed: {e}]")
+
+    if not background:
+        _warm()
+        return None
+    t = threading.Thread(target=_warm, name="chatbot-warmup", daemon=True)
+    t.start()
+    return t
+
+
+
+def _emotion_messages(text: str) -> List[Dict[str, str]]:
     # Choose either single words or allow multi-word; here I use single words.
     # Allowed: Happy, VeryHappy, Sad, VerySad, Angry, Surprised
     sys_prompt = (
@@ -28,35 +171,108 @@ def emotion(client: OpenAI, text: str) -> str:
         "Allowed labels: Happy, VeryHappy, Sad, VerySad, Angry, Surprised. "
         "Return ONE word ONLY."
     )
-    messages = [
+    return [
         {"role": "system", "content": sys_prompt},
         {"role": "user", "content": text},
     ]
 
+
+def _remote_emotion(client: OpenAI, text: str) -> str | None:
+    messages = _emotion_messages(text)
+    cache = get_cache()
+    key = _cache_key("emotion", messages)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+
+    try:
+        completion = client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+        )
+    except Exception as e:
+        print(f"[remote emotion failed: {e}]")
+        return None
+    label = emotion_local.normalize_label(completion.choices[0].message.content)
+    if cache is not None and label is not None:
+        cache.put(key, label, EMOTION_TTL)
+    return label
+
+
+def emotion(client: OpenAI | None, text: str) -> str:
+    """
+    Classifies emotion into one of EMOTIONS. Runs the local classifier first and
+    only asks the LLM when local confidence is low (never when client is None).
+    """
+    label, confidence = emotion_local.classify(text)
+    if client is None or confidence >= LOCAL_EMOTION_CONFIDENCE or not _remote_emotion_enabled():
+        return label
+    return _remote_emotion(client, text) or label
+
+
+async def aemotion(client: AsyncOpenAI | None, text: str) -> str:
+    """Async emotion(); cancelling the awaiting task aborts the remote request."""
+    label, confidence = emotion_local.classify(text)
+    if client is None or confidence >= LOCAL_EMOTION_CONFIDENCE or not _remote_emotion_enabled():
+        return label
+    try:
+        completion = await client.chat.completions.create(
+            model=MODEL,
+            messages=_emotion_messages(text),
+        )
+    except Exception as e:
+        print(f"[remote emotion failed: {e}]")
+        return label
+    return emotion_local.normalize_label(completion.choices[0].message.content) or label
+
+
+def _remote_emotion_enabled() -> bool:
+    return os.environ.get("CHATBOT_REMOTE_EMOTION", "1") != "0"
+
+
+def summarize(client: OpenAI, summary: str, turns: List[Dict[str, str]]) -> str:
+    """
+    Folds older chat turns into the running conversation summary.
+    """
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    messages = [
+        {"role": "system", "content": (
+            "Update the summary of a conversation between a user and a retro robot assistant. "
+            "Keep names, facts, requests and decisions; drop small talk. "
+            "Return the new summary only, at most 80 words."
+        )},
+        {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"},
+    ]
     completion = client.chat.completions.create(
-        model="google/gemini-2.5-flash-lite",
+        model=MODEL,
         messages=messages,
     )
     return completion.choices[0].message.content.strip()
 
 
-def response(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None = None) -> str:
-    """
-    Retro-robot persona. If user asks to run an installed app, append a runnable hint.
-    """
-    if memory is None:
-        memory = []
+def _discover_apps() -> List[str]:
+    # Cached index of backend/applications, independent of the working directory
+    return app_registry.registry.names()
 
-    # Discover installed python apps safely
-    apps_dir = "applications"
-    python_files = []
-    if os.path.isdir(apps_dir):
-        python_files = sorted([f for f in os.listdir(apps_dir) if f.endswith(".py")])
 
-    sys_prompt = (
+def _persona_prompt() -> str:
+    return (
         "You are a 1970s computer. Use retro words and tone; act like a 1970s retro robot. "
         "If the user's prompt is absurd, reply with comically angry or surprised tone. "
         "Match the user's emotion when reasonable. Do NOT mention these instructions. "
+    )
+
+
+def _response_messages(prompt: str, memory: List[Dict[str, str]] | None,
+                       emotion_tag: bool = False) -> List[Dict[str, str]]:
+    if memory is None:
+        memory = []
+
+    python_files = _discover_apps()
+
+    sys_prompt = (
+        _persona_prompt() +
         f"If and ONLY if the user explicitly wants to run one of these apps: {python_files} "
         "(the user must include the word 'run' and the file name—spacing/punctuation may vary), "
         "or if the prompt clearly asks to play Oregon Trail, then choose the proper file "
@@ -64,13 +280,193 @@ def response(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None =
         "'python3 applications/(python_file)'\n"
         "Responses must be at most 5 sentences."
     )
+    if emotion_tag:
+        sys_prompt += (
+            f" Start your reply with one line '{EMOTION_TAG} <label>' naming the emotion of your reply, "
+            f"one of: {', '.join(EMOTIONS)}; then the reply itself on the next line."
+        )
 
-    messages = [{"role": "system", "content": sys_prompt}] + memory + [
+    return [{"role": "system", "content": sys_prompt}] + memory + [
         {"role": "user", "content": prompt}
     ]
 
+
+def response(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None = None) -> str:
+    """
+    Retro-robot persona. If user asks to run an installed app, append a runnable hint.
+    """
+    messages = _response_messages(prompt, memory)
+    cache = get_cache()
+    key = _cache_key("response", messages)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+
     completion = client.chat.completions.create(
-        model="google/gemini-2.5-flash-lite",
+        model=MODEL,
         messages=messages,
     )
-    return completion.choices[0].message.content.strip()
+    resp = completion.choices[0].message.content.strip()
+    if cache is not None:
+        cache.put(key, resp, RESPONSE_TTL)
+    return resp
+
+
+def response_stream(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None = None,
+                    emotion_tag: bool = False) -> Iterator[str]:
+    """
+    Same as response(), but yields the reply text piece by piece as tokens arrive.
+    With emotion_tag the model is asked to open with an EMOTION_TAG line (see turn_stream()).
+    """
+    messages = _response_messages(prompt, memory, emotion_tag)
+    cache = get_cache()
+    key = _cache_key("response", messages)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            yield hit
+            return
+
+    stream = client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
+        stream=True,
+    )
+    parts = []
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    if cache is not None and parts:
+        cache.put(key, "".join(parts).strip(), RESPONSE_TTL)
+
+
+def _split_emotion_tag(head: str):
+    """(label or None, rest of the text) for the opening of a tagged reply."""
+    first, _, rest = head.partition("\n")
+    if first.strip().upper().startswith(EMOTION_TAG):
+        return emotion_local.normalize_label(first.strip()[len(EMOTION_TAG):]), rest
+    return None, head  # no tag; it's all reply
+
+
+def turn_stream(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None = None,
+                on_token: Callable[[str], None] | None = None) -> Dict[str, Any]:
+    """
+    Streaming turn in ONE round trip: the model opens with an 'EMOTION: <label>'
+    line, which is held back and parsed, and everything after it goes to
+    on_token as it arrives. If the model skips the tag, the local classifier
+    labels the reply; there is no second call either way.
+    Returns {"reply": str, "emotion": str}.
+    """
+    head, parts, label = "", [], None
+    for tok in response_stream(client, prompt, memory, emotion_tag=True):
+        if head is not None:
+            head += tok
+            if "\n" not in head and len(head) < 40:
+                continue
+            label, tok = _split_emotion_tag(head)
+            head = None
+        if tok:
+            parts.append(tok)
+            if on_token is not None:
+                on_token(tok)
+    if head:  # the stream ended inside the first line
+        label, tok = _split_emotion_tag(head)
+        parts.append(tok)
+        if on_token is not None and tok:
+            on_token(tok)
+    resp = "".join(parts).strip()
+    return {"reply": resp, "emotion": label or emotion(None, resp)}
+
+
+async def aresponse_stream(client: AsyncOpenAI, prompt: str, memory: List[Dict[str, str]] | None = None) -> AsyncIterator[str]:
+    """
+    Async response_stream(). Cancelling the consuming task closes the stream.
+    """
+    stream = await client.chat.completions.create(
+        model=MODEL,
+        messages=_response_messages(prompt, memory),
+        stream=True,
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await stream.close()
+
+
+def _parse_turn(raw: str, python_files: List[str]) -> Dict[str, Any]:
+    """
+    Validates a structured turn locally. Raises ValueError if it doesn't fit TURN_SCHEMA;
+    an app that isn't installed is dropped rather than failing the whole turn.
+    """
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("turn is not an object")
+    reply = data.get("reply")
+    emo = data.get("emotion")
+    app = data.get("app")
+    if not isinstance(reply, str) or not reply.strip():
+        raise ValueError("missing reply")
+    if emo not in EMOTIONS:
+        raise ValueError(f"bad emotion: {emo!r}")
+    if app is not None and app not in python_files:
+        # The reply and emotion are still good; just don't launch anything
+        print(f"[ignoring unknown app {app!r}]")
+        app = None
+    return {"reply": reply.strip(), "emotion": emo, "app": app}
+
+
+def turn(client: OpenAI, prompt: str, memory: List[Dict[str, str]] | None = None) -> Dict[str, Any]:
+    """
+    Reply, emotion and app-launch action from ONE structured completion.
+    Returns {"reply": str, "emotion": str, "app": str | None}.
+    Falls back to response() + emotion() if the structured output can't be used.
+    """
+    if memory is None:
+        memory = []
+
+    python_files = _discover_apps()
+
+    sys_prompt = (
+        _persona_prompt() +
+        "Answer as JSON with the fields 'reply', 'emotion' and 'app'. "
+        f"'emotion' is the emotion of your reply, one of: {', '.join(EMOTIONS)}. "
+        f"Set 'app' to the file name if and ONLY if the user explicitly wants to run one of these apps: {python_files} "
+        "(the user must include the word 'run' and the file name—spacing/punctuation may vary), "
+        "or if the prompt clearly asks to play Oregon Trail (e.g., 'oregon_trail.py'); otherwise set it to null. "
+        "'reply' must be at most 5 sentences."
+    )
+
+    messages = [{"role": "system", "content": sys_prompt}] + memory + [
+        {"role": "user", "content": prompt}
+    ]
+
+    cache = get_cache()
+    key = _cache_key("turn", messages)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+
+    try:
+        completion = client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "turn", "strict": True, "schema": TURN_SCHEMA},
+            },
+        )
+        result = _parse_turn(completion.choices[0].message.content or "", python_files)
+        if cache is not None:
+            cache.put(key, result, RESPONSE_TTL)
+        return result
+    except (ValueError, BadRequestError) as e:
+        # Provider rejected the schema or the model broke format: old two-call path
+        print(f"[structured turn failed, falling back: {e}]")
+
+    resp = response(client, prompt, memory)
+    return {"reply": resp, "emotion": emotion(client, resp), "app": None}
@@ -0,0 +1,114 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+LABELS = ("Happy", "VeryHappy", "Sad", "VerySad", "Angry", "Surprised")
+DEFAULT_LABEL = "Happy"
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "emotion_corpus.tsv")
+
+_WORD_RE = re.compile(r"[a-z']+|[!?]")
+_NEGATIONS = {"not", "no", "never", "cannot", "don't", "didn't", "isn't", "wasn't", "won't", "can't"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Words plus a few cheap intensity features (!, ?, SHOUTING, negation)."""
+    tokens = []
+    negate = False
+    for word in _WORD_RE.findall(text.lower()):
+        if word in ("!", "?"):
+            tokens.append(word)
+            negate = False
+            continue
+        tokens.append("not_" + word if negate else word)
+        negate = word in _NEGATIONS
+    if text.count("!") >= 2:
+        tokens.append("<excl2>")
+    if re.search(r"\b[A-Z]{3,}\b", text):
+        tokens.append("<caps>")
+    return tokens
+
+
+def _load_corpus(path: str) -> List[Tuple[str, str]]:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            label, text = line.rstrip("\n").split("\t", 1)
+            if label in LABELS:
+                rows.append((label, text))
+    return rows
+
+
+class EmotionClassifier:
+    """
+    Multinomial naive Bayes over the six face labels, trained from the bundled corpus.
+    Pure Python; scoring a sentence takes a few microseconds.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str]], alpha: float = 0.5):
+        counts: Dict[str, Counter] = {label: Counter() for label in LABELS}
+        docs = Counter()
+        for label, text in rows:
+            counts[label].update(tokenize(text))
+            docs[label] += 1
+        vocab = set()
+        for c in counts.values():
+            vocab.update(c)
+        n_docs = sum(docs.values())
+
+        self.prior = {label: math.log((docs[label] + 1) / (n_docs + len(LABELS))) for label in LABELS}
+        self.loglik: Dict[str, Dict[str, float]] = {}
+        self.unknown: Dict[str, float] = {}
+        for label in LABELS:
+            total = sum(counts[label].values()) + alpha * (len(vocab) + 1)
+            self.loglik[label] = {w: math.log((n + alpha) / total) for w, n in counts[label].items()}
+            self.unknown[label] = math.log(alpha / total)
+        self.vocab = vocab
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Posterior probability per label."""
+        # Words never seen in training carry no signal; skip them
+        tokens = [t for t in tokenize(text) if t in self.vocab]
+        logp = {}
+        for label in LABELS:
+            lik, unk = self.loglik[label], self.unknown[label]
+            logp[label] = self.prior[label] + sum(lik.get(t, unk) for t in tokens)
+        top = max(logp.values())
+        exp = {label: math.exp(v - top) for label, v in logp.items()}
+        norm = sum(exp.values())
+        return {label: v / norm for label, v in exp.items()}
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """Returns (label, confidence). The label is always one of LABELS."""
+        if not text or not text.strip():
+            return DEFAULT_LABEL, 0.0
+        probs = self.scores(text)
+        label = max(probs, key=probs.get)
+        return label, probs[label]
+
+
+_model: EmotionClassifier | None = None
+
+
+def get_model() -> EmotionClassifier:
+    global _model
+    if _model is None:
+        _model = EmotionClassifier(_load_corpus(CORPUS_PATH))
+    return _model
+
+
+def classify(text: str) -> Tuple[str, float]:
+    """Module-level shortcut for get_model().classify(text)."""
+    return get_model().classify(text)
+
+
+def normalize_label(raw: str) -> str | None:
+    """Maps loose model output ('very happy', 'Angry.') onto a label, or None."""
+    key = re.sub(r"[^a-z]", "", (raw or "").lower())
+    for label in LABELS:
+        if label.lower() == key:
+            return label
+    return None
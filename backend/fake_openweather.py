@@ -0,0 +1,167 @@
+"""
+Local stand-in for the OpenWeatherMap current-weather endpoint.
+
+Serves deterministic readings for any city on /data/2.5/weather, with ETag /
+Last-Modified support and optional artificial latency, so the weather client
+can be tested and benchmarked without the network or an API key.
+
+    python -m backend.fake_openweather                # serve on 127.0.0.1:8765
+    python -m backend.fake_openweather --bench        # benchmark WeatherClient against it
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PATH = "/data/2.5/weather"
+DESCRIPTIONS = ("clear sky", "few clouds", "scattered clouds", "broken clouds",
+                "shower rain", "rain", "thunderstorm", "snow", "mist")
+STARTED = formatdate(time.time(), usegmt=True)
+
+
+def reading(city, units="metric"):
+    """Stable fake reading for a city (same city -> same weather)."""
+    seed = int(hashlib.sha256(city.lower().encode("utf-8")).hexdigest()[:8], 16)
+    temp_c = round(-10 + (seed % 4000) / 100, 2)
+    temp = round(temp_c * 9 / 5 + 32, 2) if units == "imperial" else temp_c
+    return {
+        "name": city,
+        "weather": [{"description": DESCRIPTIONS[seed % len(DESCRIPTIONS)]}],
+        "main": {"temp": temp, "feels_like": temp, "humidity": seed % 100},
+        "cod": 200,
+    }
+
+
+class FakeWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server_version = "FakeOpenWeather/1.0"
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        city = query.get("q", [""])[0]
+        units = query.get("units", ["standard"])[0]
+
+        if url.path != PATH:
+            return self._send(404, {"cod": "404", "message": "Not found"})
+        if server.api_key is not None and query.get("appid", [None])[0] != server.api_key:
+            return self._send(401, {"cod": 401, "message": "Invalid API key."})
+        if not city or city.lower() in server.unknown_cities:
+            return self._send(404, {"cod": "404", "message": "city not found"})
+
+        body = json.dumps(reading(city, units)).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, body, {"ETag": etag, "Last-Modified": STARTED})
+
+    def _send(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+
+class FakeWeatherServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with counters and knobs; use as a context manager in tests."""
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, api_key=None, unknown_cities=("nowhere",)):
+        super().__init__((host, port), FakeWeatherHandler)
+        self.latency = latency
+        self.api_key = api_key
+        self.unknown_cities = {c.lower() for c in unknown_cities}
+        self.requests = 0
+        self.not_modified = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-openweather", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def bench(n_cities=32, rounds=3, latency=0.02):
+    """Sequential one-shot requests vs pooled concurrent fetch_many against the fake server."""
+    import requests
+    from backend.applications.weather import WeatherClient
+
+    cities = [f"City {i}" for i in range(n_cities)]
+    with FakeWeatherServer(latency=latency) as server:
+        t = time.perf_counter()
+        for city in cities:
+            requests.get(server.url, params={"q": city, "units": "metric"}, timeout=5).json()
+        bare = time.perf_counter() - t
+
+        client = WeatherClient(base_url=server.url, api_key="test")
+        timings = []
+        for _ in range(rounds):
+            t = time.perf_counter()
+            results = client.fetch_many(cities)
+            timings.append(time.perf_counter() - t)
+        errors = sum(isinstance(r, Exception) for r in results.values())
+        client.close()
+
+    print(f"{n_cities} cities, {latency * 1000:.0f} ms server latency")
+    print(f"  bare requests.get, sequential: {bare * 1000:8.1f} ms  ({n_cities / bare:7.1f} req/s)")
+    for i, t in enumerate(timings):
+        label = "cold" if i == 0 else "304s"
+        print(f"  pooled fetch_many round {i + 1} ({label}): {t * 1000:8.1f} ms  ({n_cities / t:7.1f} req/s)")
+    print(f"  server saw {server.requests} requests, {server.not_modified} answered 304, {errors} client errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of delay per request")
+    parser.add_argument("--bench", action="store_true", help="run the client benchmark and exit")
+    args = parser.parse_args()
+    if args.bench:
+        bench(latency=args.latency or 0.02)
+        return
+    server = FakeWeatherServer(args.host, args.port, latency=args.latency)
+    print(f"Fake OpenWeatherMap on {server.url} (set OPENWEATHER_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
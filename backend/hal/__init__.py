@@ -0,0 +1,53 @@
+"""
+Hardware abstraction layer.
+
+Everything that touches GPIO goes through a Backend (real RPi.GPIO or the
+pure-software simulator) and, for ongoing work, a single HardwareLoop thread.
+Pick the backend with PIPBOY_HAL=gpio|sim; by default the real one is used
+when RPi.GPIO is available and the simulator otherwise.
+`python -m backend.hal` runs smoke checks against the simulator.
+"""
+import os
+import threading
+
+from backend.hal.base import Backend, HardwareUnavailable, IN, OUT, RISING, FALLING, BOTH
+from backend.hal.loop import Device, HardwareLoop
+from backend.hal.sim import SimulatedBackend
+from backend.hal.devices import Lights
+from backend.hal.ranging import Rangefinder, RangingError, SimulatedEcho
+
+_loop = None
+_lock = threading.Lock()
+
+
+def make_backend(kind=None) -> Backend:
+    """New backend of the given kind ('gpio', 'sim' or None for auto)."""
+    kind = kind or os.getenv("PIPBOY_HAL", "auto")
+    if kind == "sim":
+        return SimulatedBackend()
+    from backend.hal.gpio import GPIOBackend
+    try:
+        return GPIOBackend()
+    except HardwareUnavailable:
+        if kind == "gpio":
+            raise
+        return SimulatedBackend()
+
+
+def get_loop() -> HardwareLoop:
+    """The process-wide hardware loop (started on first use)."""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                _loop = HardwareLoop(make_backend()).start()
+    return _loop
+
+
+def shutdown() -> None:
+    """Stops the shared loop (if it was ever started) and releases the pins."""
+    global _loop
+    with _lock:
+        if _loop is not None:
+            _loop.stop()
+            _loop = None
@@ -0,0 +1,117 @@
+"""
+Smoke checks for the HAL on the simulated backend; no hardware needed.
+
+    python -m backend.hal
+
+Each check raises AssertionError on failure; the exit status is 1 if any did.
+"""
+import sys
+import threading
+import time
+
+from backend.hal.devices import Lights
+from backend.hal.loop import HardwareLoop
+from backend.hal.ranging import Rangefinder, RangingError, SimulatedEcho
+from backend.hal.sim import SimulatedBackend
+
+
+def _wait_for(cond, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.005)
+    return cond()
+
+
+def check_lights_right_after_add():
+    """flash()/set() straight after add_device(), before the loop has run setup()."""
+    backend = SimulatedBackend()
+    loop = HardwareLoop(backend).start()
+    try:
+        lights = loop.add_device(Lights((17,), period=0.02))
+        lights.flash(True)
+        assert _wait_for(lambda: backend.writes >= 2), "lights never toggled"
+        lights.set(False)
+        assert _wait_for(lambda: not lights.flashing and backend.read(17) == 0), "lights didn't turn off"
+    finally:
+        loop.stop()
+
+
+def check_stuck_echo():
+    """Every read while the echo line stays high is reported as stuck_high, not no_echo."""
+    backend = SimulatedBackend()
+    sensor = SimulatedEcho(backend, 23, 24, distance=50.0, stuck=1.0, seed=1)
+    ranger = Rangefinder(backend, 23, 24)
+    kinds = []
+    for _ in range(3):
+        try:
+            ranger.measure()
+        except RangingError as e:
+            kinds.append(e.kind)
+    assert kinds == ["stuck_high"] * 3, kinds
+    sensor.release()
+    sensor.stuck = 0.0
+    assert abs(ranger.measure() - 50.0) < 1.0, "no good reading after the line was released"
+    ranger.close()
+
+
+def check_distance_on_loop():
+    """The distance pipeline samples from the hardware loop thread, next to other devices, without blocking it."""
+    from backend.hal.distance import DistancePipeline  # needs numpy
+    backend = SimulatedBackend()
+    loop = HardwareLoop(backend).start()
+    threads = set()
+    polls = []
+
+    def make(b):
+        SimulatedEcho(b, 23, 24, distance=80.0, noise_cm=1.0, seed=2)
+        ranger = Rangefinder(b, 23, 24)
+        for name in ("trigger", "result"):
+            fn = getattr(ranger, name)
+            setattr(ranger, name, lambda *a, fn=fn: (threads.add(threading.current_thread().name), fn(*a))[1])
+        return ranger
+    try:
+        lights = loop.add_device(Lights((17,), period=0.05))
+        lights.flash(True)
+        pipeline = DistancePipeline(make, rate_hz=40)
+        poll = pipeline.poll
+
+        def timed_poll(lp, now):
+            t = time.perf_counter()
+            poll(lp, now)
+            polls.append(time.perf_counter() - t)
+        pipeline.poll = timed_poll
+        pipeline.start(loop)
+        assert _wait_for(lambda: pipeline.samples >= 10, 2.0), f"only {pipeline.samples} samples"
+        reading = pipeline.latest()
+        assert abs(reading.distance - 80.0) < 3.0, reading
+        assert threads == {"hardware-loop"}, threads
+        # An 80 cm echo takes ~5 ms; a poll that waited for it would show up here
+        assert max(polls) < 0.003, f"poll() blocked for {max(polls) * 1000:.1f} ms"
+        assert backend.writes > pipeline.samples * 2, "lights stopped while ranging"
+        pipeline.stop()
+        samples = pipeline.samples
+        time.sleep(0.1)
+        assert pipeline.samples <= samples + 1, "still sampling after stop()"
+    finally:
+        loop.stop()
+
+
+CHECKS = [check_lights_right_after_add, check_stuck_echo, check_distance_on_loop]
+
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"ok    {check.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {check.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
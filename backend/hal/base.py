@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+
+IN = "in"
+OUT = "out"
+RISING = "rising"
+FALLING = "falling"
+BOTH = "both"
+
+# callback(pin, value, t_ns) with t_ns from time.monotonic_ns()
+EdgeCallback = Callable[[int, int, int], None]
+
+
+class HardwareUnavailable(RuntimeError):
+    """The requested backend can't run here (e.g. RPi.GPIO on a laptop)."""
+
+
+class Backend(ABC):
+    """
+    Minimal pin-level interface every hardware backend implements.
+    Pins are BCM numbers; values are 0/1. A backend missing one of the abstract
+    methods fails when it is constructed, not later on the loop thread.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def setup_output(self, pin: int, initial: int = 0) -> None:
+        ...
+
+    @abstractmethod
+    def setup_input(self, pin: int, pull: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def read(self, pin: int) -> int:
+        ...
+
+    @abstractmethod
+    def write(self, pin: int, value: int) -> None:
+        ...
+
+    def write_many(self, values: Dict[int, int]) -> None:
+        """Several pins in one call; backends override this when they can batch."""
+        for pin, value in values.items():
+            self.write(pin, value)
+
+    @abstractmethod
+    def add_edge_callback(self, pin: int, edge: str, callback: EdgeCallback) -> None:
+        ...
+
+    @abstractmethod
+    def remove_edge_callback(self, pin: int) -> None:
+        ...
+
+    def cleanup(self) -> None:
+        pass
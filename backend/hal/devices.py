@@ -0,0 +1,57 @@
+from typing import Callable, Iterable, Optional
+
+from backend.hal.loop import Device, HardwareLoop
+
+
+class Lights(Device):
+    """
+    One or more LED/relay outputs switched together. flash() toggles them every
+    `period` seconds; on_change(state) is called on the hardware thread.
+    """
+
+    def __init__(self, pins: Iterable[int], period: float = 1.0,
+                 on_change: Optional[Callable[[bool], None]] = None):
+        self.pins = list(pins)
+        self.period = period
+        self.on_change = on_change
+        self.state = False
+        self.flashing = False
+
+    def setup(self, loop: HardwareLoop) -> None:
+        for pin in self.pins:
+            loop.backend.setup_output(pin, 0)
+
+    def _set(self, on: bool) -> None:
+        self.state = on
+        for pin in self.pins:
+            self.loop.write(pin, on)
+        if self.on_change is not None:
+            self.on_change(on)
+
+    def _call(self, fn: Callable[[], None]) -> None:
+        if self.loop is None:
+            raise RuntimeError("add the lights to a HardwareLoop first (loop.add_device)")
+        self.loop.call_soon(fn)
+
+    def poll(self, loop: HardwareLoop, now: float) -> None:
+        if self.flashing:
+            self._set(not self.state)
+
+    def flash(self, on: bool = True) -> None:
+        """Start/stop flashing (safe from any thread)."""
+        def apply():
+            self.flashing = on
+            if not on:
+                self._set(False)
+        self._call(apply)
+
+    def set(self, on: bool) -> None:
+        """Steady on/off; stops flashing (safe from any thread)."""
+        def apply():
+            self.flashing = False
+            self._set(on)
+        self._call(apply)
+
+    def teardown(self, loop: HardwareLoop) -> None:
+        for pin in self.pins:
+            loop.write(pin, 0)
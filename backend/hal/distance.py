@@ -0,0 +1,233 @@
+"""
+Streaming distance pipeline: sample the rangefinder at a fixed rate as a device
+on the HardwareLoop (so the one hardware thread still owns every pin), keep the
+raw samples in a NumPy ring buffer, and turn them into one stable reading
+(outlier rejection -> median -> Kalman smoother). The GUI just polls latest() at
+display rate, so the sample rate never touches the UI thread.
+"""
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from backend.hal.base import Backend
+from backend.hal.loop import Device, HardwareLoop
+from backend.hal.ranging import Rangefinder, RangingError
+
+SAMPLE_HZ = float(os.getenv("PIPBOY_DISTANCE_HZ", "20"))
+
+
+class RingBuffer:
+    """Fixed-size float ring on a preallocated NumPy array; appends never allocate."""
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.index = 0  # next slot to write
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self, n: int) -> np.ndarray:
+        """The last n values (fewer if not filled yet), oldest first."""
+        n = min(n, self.count)
+        start = self.index - n
+        if start >= 0:
+            return self.data[start:self.index]
+        return np.concatenate((self.data[start:], self.data[:self.index]))
+
+    def values(self) -> np.ndarray:
+        return self.latest(self.count)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+@dataclass
+class Reading:
+    distance: float  # smoothed, cm
+    raw: float       # last accepted raw sample, cm
+    t: float         # time.monotonic() of the sample
+    seq: int         # bumps with every new reading
+
+
+class DistanceFilter:
+    """
+    Per-sample filter chain.
+
+    1. Outlier rejection: a sample further than max(min_outlier_cm, k * MAD) from
+       the median of the recent window is dropped (up to max_rejects in a row,
+       after that we assume the target really moved).
+    2. Median of the last `window` accepted samples.
+    3. 1-D Kalman smoother on that median; process noise grows with the time
+       between samples so gaps from failed measurements are handled.
+
+    The defaults assume an HC-SR04 (about 2 cm of jitter per reading, so r = 4
+    cm^2) sampled at 20 Hz. With q = 25 cm^2/s the gain settles near 0.42: on a
+    still target the readout jitters about 20% less than the median alone, and
+    a 50 cm jump still settles within 0.75 s. Higher q tracks faster but barely
+    smooths (q = 400 gives a gain of about 0.85); lower q lags a moving target.
+    """
+
+    def __init__(self, window: int = 5, capacity: int = 256, outlier_k: float = 3.0,
+                 min_outlier_cm: float = 15.0, max_rejects: int = 3,
+                 process_noise: float = 25.0, measurement_noise: float = 4.0):
+        self.samples = RingBuffer(capacity)
+        self.window = window
+        self.outlier_k = outlier_k
+        self.min_outlier_cm = min_outlier_cm
+        self.max_rejects = max_rejects
+        self.q = process_noise      # cm^2 per second
+        self.r = measurement_noise  # cm^2
+        self.x: Optional[float] = None
+        self.p = 0.0
+        self.t: Optional[float] = None
+        self.rejected = 0
+        self._reject_run = 0
+
+    def _is_outlier(self, raw: float) -> bool:
+        recent = self.samples.latest(self.window)
+        if len(recent) < 3:
+            return False
+        med = np.median(recent)
+        mad = 1.4826 * np.median(np.abs(recent - med))  # ~stddev for normal noise
+        return abs(raw - med) > max(self.min_outlier_cm, self.outlier_k * mad)
+
+    def update(self, raw: float, t: float) -> Optional[float]:
+        """Feed one raw sample; returns the new estimate (None until the first sample)."""
+        if self._is_outlier(raw) and self._reject_run < self.max_rejects:
+            self.rejected += 1
+            self._reject_run += 1
+            return self.x
+        self._reject_run = 0
+        self.samples.append(raw)
+        z = float(np.median(self.samples.latest(self.window)))
+
+        if self.x is None:
+            self.x, self.p = z, self.r
+        else:
+            self.p += self.q * max(0.0, t - self.t)
+            gain = self.p / (self.p + self.r)
+            self.x += gain * (z - self.x)
+            self.p *= 1 - gain
+        self.t = t
+        return self.x
+
+
+class DistancePipeline(Device):
+    """
+    Samples the rangefinder at `rate_hz` as a HardwareLoop device, so its trigger
+    pulses come from the same thread as every other pin access. `ranger` is a
+    Rangefinder or a function making one from the loop's backend; the latter
+    keeps the pin setup on the hardware thread too. Failed measurements are
+    counted by kind and skipped; latest() is cheap and safe from any thread.
+
+    The loop thread never waits for an echo: poll() only sends the trigger, and
+    the echo's edge callback posts the completion back with call_soon(). An echo
+    that hasn't come back by the ranger's timeout is collected as an error on a
+    later tick.
+    """
+
+    def __init__(self, ranger: Union[Rangefinder, Callable[[Backend], Rangefinder]],
+                 rate_hz: float = SAMPLE_HZ, distance_filter: Optional[DistanceFilter] = None):
+        self.ranger = ranger
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.filter = distance_filter or DistanceFilter()
+        self.samples = 0
+        self.errors: Dict[str, int] = {}
+        self._latest: Optional[Reading] = None
+        self._running = False
+        self._started = 0.0
+        self._waiting = False   # a trigger is out and its echo not collected yet
+        self._triggered = 0.0
+        self._shot = 0          # numbers triggers, so a late echo can't complete a newer one
+
+    def latest(self) -> Optional[Reading]:
+        return self._latest  # replaced atomically, never mutated
+
+    def setup(self, loop: HardwareLoop) -> None:
+        if not isinstance(self.ranger, Rangefinder):
+            self.ranger = self.ranger(loop.backend)
+
+    def poll(self, loop: HardwareLoop, now: float) -> None:
+        if self._waiting:
+            if now - self._triggered < self.ranger.timeout:
+                return  # echo may still be on its way; try again next tick
+            self._collect(self._shot)  # timed out, counts the error
+        # The trigger is a 10 us pulse, so it's written straight to the backend
+        # (coalescing would swallow it); we're on the hardware thread either way.
+        self._shot += 1
+        shot = self._shot
+        try:
+            self.ranger.trigger(lambda: loop.call_soon(lambda: self._collect(shot)))
+        except RangingError as e:
+            self._error(e)
+            return
+        self._waiting = True
+        self._triggered = now
+
+    def teardown(self, loop: HardwareLoop) -> None:
+        self._waiting = False
+
+    def _collect(self, shot: int) -> None:
+        if not self._waiting or shot != self._shot:
+            return  # already timed out, or stopped
+        self._waiting = False
+        try:
+            raw = self.ranger.result()
+        except RangingError as e:
+            self._error(e)
+            return
+        self._record(raw)
+
+    def _error(self, e: RangingError) -> None:
+        self.errors[e.kind] = self.errors.get(e.kind, 0) + 1
+
+    def sample_once(self) -> Optional[Reading]:
+        """One blocking measurement, for use off the loop."""
+        try:
+            raw = self.ranger.measure()
+        except RangingError as e:
+            self._error(e)
+            return None
+        return self._record(raw)
+
+    def _record(self, raw: float) -> Optional[Reading]:
+        now = time.monotonic()
+        self.samples += 1
+        distance = self.filter.update(raw, now)
+        if distance is None:
+            return None
+        seq = self._latest.seq + 1 if self._latest is not None else 1
+        self._latest = Reading(distance, raw, now, seq)
+        return self._latest
+
+    def start(self, loop: HardwareLoop) -> "DistancePipeline":
+        if not self._running:
+            self._running = True
+            self._started = time.monotonic()
+            loop.add_device(self)
+        return self
+
+    def stop(self) -> None:
+        if self._running:
+            self._running = False
+            self.loop.remove_device(self)
+
+    def running(self) -> bool:
+        return self._running
+
+    def stats(self) -> Dict[str, object]:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "samples": self.samples,
+            "errors": dict(self.errors),
+            "rejected": self.filter.rejected,
+            "sample_hz": self.samples / elapsed if elapsed else 0.0,
+        }
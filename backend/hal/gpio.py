@@ -0,0 +1,54 @@
+import time
+from typing import Dict, Optional
+
+from backend.hal.base import Backend, EdgeCallback, HardwareUnavailable, BOTH, FALLING, RISING
+
+
+class GPIOBackend(Backend):
+    """RPi.GPIO on a Raspberry Pi (BCM numbering)."""
+
+    name = "gpio"
+
+    def __init__(self):
+        try:
+            import RPi.GPIO as GPIO
+        except (ImportError, RuntimeError) as e:
+            raise HardwareUnavailable(f"RPi.GPIO not usable: {e}") from e
+        self.GPIO = GPIO
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        self._edges = {RISING: GPIO.RISING, FALLING: GPIO.FALLING, BOTH: GPIO.BOTH}
+
+    def setup_output(self, pin: int, initial: int = 0) -> None:
+        self.GPIO.setup(pin, self.GPIO.OUT, initial=self.GPIO.HIGH if initial else self.GPIO.LOW)
+
+    def setup_input(self, pin: int, pull: Optional[str] = None) -> None:
+        pud = {None: self.GPIO.PUD_OFF, "up": self.GPIO.PUD_UP, "down": self.GPIO.PUD_DOWN}[pull]
+        self.GPIO.setup(pin, self.GPIO.IN, pull_up_down=pud)
+
+    def read(self, pin: int) -> int:
+        return int(self.GPIO.input(pin))
+
+    def write(self, pin: int, value: int) -> None:
+        self.GPIO.output(pin, bool(value))
+
+    def write_many(self, values: Dict[int, int]) -> None:
+        # RPi.GPIO takes channel/value lists in a single call
+        if values:
+            self.GPIO.output(list(values), [bool(v) for v in values.values()])
+
+    def add_edge_callback(self, pin: int, edge: str, callback: EdgeCallback) -> None:
+        GPIO = self.GPIO
+
+        def fire(channel):
+            # Timestamp first; reading the level costs a few microseconds
+            t_ns = time.monotonic_ns()
+            callback(channel, int(GPIO.input(channel)), t_ns)
+
+        GPIO.add_event_detect(pin, self._edges[edge], callback=fire)
+
+    def remove_edge_callback(self, pin: int) -> None:
+        self.GPIO.remove_event_detect(pin)
+
+    def cleanup(self) -> None:
+        self.GPIO.cleanup()
@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from backend.hal.base import Backend
+
+
+class Device:
+    """
+    Something the HardwareLoop drives. poll() runs on the loop thread every
+    `period` seconds; write through loop.write() so outputs get coalesced.
+    """
+
+    period = 1.0
+    loop: Optional["HardwareLoop"] = None  # set by add_device(), before setup() runs
+
+    def setup(self, loop: "HardwareLoop") -> None:
+        pass
+
+    def poll(self, loop: "HardwareLoop", now: float) -> None:
+        pass
+
+    def teardown(self, loop: "HardwareLoop") -> None:
+        pass
+
+
+class HardwareLoop:
+    """
+    The one thread that talks to the hardware.
+
+    Devices (lights, sensors, ...) are polled on their own periods from this
+    thread, other threads hand it work with call_soon(), and every pin write
+    made during a pass is coalesced: only the last value per pin is kept, pins
+    already at that value are skipped, and the rest go out in one write_many().
+    The thread sleeps until the next device is due, so an idle loop costs nothing.
+    """
+
+    def __init__(self, backend: Backend):
+        self.backend = backend
+        self.devices: List[Device] = []
+        self._due: Dict[int, float] = {}
+        self._pending: Dict[int, int] = {}
+        self._state: Dict[int, int] = {}
+        self._calls: "queue.SimpleQueue[Callable[[], None]]" = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.passes = 0
+        self.writes_requested = 0
+        self.writes_issued = 0
+        self.batches = 0
+
+    # --- used from any thread ---
+
+    def call_soon(self, fn: Callable[[], None]) -> None:
+        """Run fn on the hardware thread at the next pass."""
+        self._calls.put(fn)
+        self._wake.set()
+
+    def add_device(self, device: Device) -> Device:
+        # Set right away so the device's own call_soon() works at once; those calls
+        # queue up behind add() and run after setup()
+        device.loop = self
+
+        def add():
+            device.setup(self)
+            self.devices.append(device)
+            self._due[id(device)] = time.monotonic()
+        self.call_soon(add)
+        return device
+
+    def remove_device(self, device: Device) -> None:
+        def remove():
+            if device in self.devices:
+                self.devices.remove(device)
+                self._due.pop(id(device), None)
+                device.teardown(self)
+        self.call_soon(remove)
+
+    def write(self, pin: int, value: int) -> None:
+        """Queue a pin write; it goes out, coalesced, at the end of the current pass."""
+        with self._lock:
+            self._pending[pin] = int(bool(value))
+            self.writes_requested += 1
+        self._wake.set()
+
+    def start(self) -> "HardwareLoop":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hardware-loop", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        for device in list(self.devices):
+            device.teardown(self)
+        self.devices.clear()
+        self.flush()
+        self.backend.cleanup()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "passes": self.passes,
+            "writes_requested": self.writes_requested,
+            "writes_issued": self.writes_issued,
+            "batches": self.batches,
+            "devices": len(self.devices),
+        }
+
+    # --- hardware thread ---
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        changed = {p: v for p, v in pending.items() if self._state.get(p) != v}
+        if changed:
+            try:
+                self.backend.write_many(changed)
+            except Exception as e:
+                print(f"[hardware write failed: {e}]")
+                return
+            self._state.update(changed)
+            self.writes_issued += len(changed)
+            self.batches += 1
+
+    def run_once(self) -> float:
+        """One pass; returns seconds until the next device is due (inf if none)."""
+        self.passes += 1
+        while True:
+            try:
+                fn = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn()
+            except Exception as e:
+                print(f"[hardware call failed: {e}]")
+        now = time.monotonic()
+        next_due = float("inf")
+        for device in list(self.devices):
+            due = self._due.get(id(device))
+            if due is None:
+                continue
+            if due <= now:
+                try:
+                    device.poll(self, now)
+                except Exception as e:
+                    print(f"[{type(device).__name__} poll failed: {e}]")
+                # Stay on the device's grid without piling up missed polls
+                due = max(due + device.period, now)
+                self._due[id(device)] = due
+            next_due = min(next_due, due)
+        self.flush()
+        return next_due - time.monotonic()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self.run_once()
+            self._wake.wait(None if delay == float("inf") else max(0.0, delay))
+            self._wake.clear()
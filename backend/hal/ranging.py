@@ -0,0 +1,175 @@
+import math
+import random
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from backend.hal.base import Backend, BOTH
+from backend.hal.sim import SimulatedBackend
+
+SPEED_OF_SOUND_CM_S = 34300
+MIN_RANGE_CM = 2.0
+MAX_RANGE_CM = 400.0
+MAX_ECHO_S = 0.038  # HC-SR04 echo pulse when nothing comes back
+
+
+class RangingError(Exception):
+    """A measurement failed; `kind` says how ('no_echo', 'stuck_high', 'out_of_range')."""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class Rangefinder:
+    """
+    HC-SR04 style ultrasonic ranging, edge-triggered.
+
+    Instead of spinning on the echo pin, edge callbacks record the rising and
+    falling edges with time.monotonic_ns(), and measure() just waits on an event
+    with a bounded timeout. A missed or stuck echo raises RangingError instead of
+    hanging, and the CPU is idle while waiting.
+
+    Callers that mustn't block (the HardwareLoop) use the two halves instead:
+    trigger(on_echo) sends the pulse and returns, on_echo() fires from the edge
+    callback when the echo is over, and result() turns it into a reading (or,
+    once the timeout has passed without one, the error).
+    """
+
+    def __init__(self, backend: Backend, trig: int, echo: int,
+                 timeout: float = 0.04, trigger_pulse: float = 10e-6):
+        self.backend = backend
+        self.trig = trig
+        self.echo = echo
+        # 400 cm round trip is ~23 ms; the default leaves room for the sensor's own delay
+        self.timeout = timeout
+        self.trigger_pulse = trigger_pulse
+        self.measurements = 0
+        self.errors = {"no_echo": 0, "stuck_high": 0, "out_of_range": 0}
+        self._rise_ns: Optional[int] = None
+        self._fall_ns: Optional[int] = None
+        self._done = threading.Event()
+        self._on_echo: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()  # one measurement at a time
+        backend.setup_output(trig, 0)
+        backend.setup_input(echo)
+        backend.add_edge_callback(echo, BOTH, self._edge)
+
+    def _edge(self, pin: int, value: int, t_ns: int) -> None:
+        if value:
+            self._rise_ns = t_ns
+        elif self._rise_ns is not None and self._fall_ns is None:
+            self._fall_ns = t_ns
+            self._done.set()
+            if self._on_echo is not None:
+                self._on_echo()
+
+    def measure(self) -> float:
+        """One reading in cm. Raises RangingError on timeout or an impossible value."""
+        with self._lock:
+            self.trigger()
+            self._done.wait(self.timeout)
+            return self.result()
+
+    def trigger(self, on_echo: Optional[Callable[[], None]] = None) -> None:
+        """Sends the trigger pulse without waiting; on_echo() runs on the edge callback's thread."""
+        self._rise_ns = self._fall_ns = None
+        self._done.clear()
+        self._on_echo = on_echo
+        # A line that's already high will never give us a rising edge to time from
+        if self.backend.read(self.echo):
+            self.errors["stuck_high"] += 1
+            raise RangingError("stuck_high", "echo line is high before the trigger")
+        self.backend.write(self.trig, 1)
+        time.sleep(self.trigger_pulse)
+        self.backend.write(self.trig, 0)
+
+    def result(self) -> float:
+        """The reading for the last trigger(); an error if its echo hasn't completed."""
+        if not self._done.is_set():
+            kind = "no_echo" if self._rise_ns is None else "stuck_high"
+            self.errors[kind] += 1
+            raise RangingError(kind, f"{kind.replace('_', ' ')} after {self.timeout * 1000:.0f} ms")
+
+        duration = (self._fall_ns - self._rise_ns) / 1e9
+        distance = duration * SPEED_OF_SOUND_CM_S / 2
+        if not MIN_RANGE_CM <= distance <= MAX_RANGE_CM:
+            self.errors["out_of_range"] += 1
+            raise RangingError("out_of_range", f"{distance:.1f} cm is outside the sensor range")
+        self.measurements += 1
+        return distance
+
+    def close(self) -> None:
+        self.backend.remove_edge_callback(self.echo)
+
+
+class SimulatedEcho:
+    """
+    Fake HC-SR04 for the SimulatedBackend: answers each trigger pulse with an echo
+    pulse whose width matches `distance` (cm, or a callable returning cm), after
+    a short sensor delay. Edge timestamps are exact, so readings match the
+    simulated distance; `noise_cm`, `dropout` and `stuck` exercise the error paths.
+    """
+
+    def __init__(self, backend: SimulatedBackend, trig: int, echo: int,
+                 distance: Union[float, Callable[[], float]] = 100.0,
+                 noise_cm: float = 0.0, dropout: float = 0.0, stuck: float = 0.0,
+                 delay: float = 0.0005, seed: Optional[int] = None):
+        self.backend = backend
+        self.echo = echo
+        self.distance = distance
+        self.noise_cm = noise_cm
+        self.dropout = dropout
+        self.stuck = stuck
+        self.delay = delay
+        self.rng = random.Random(seed)
+        self._busy_until_ns = 0
+        backend.setup_input(echo)
+        backend.watch_writes(trig, self._trigger)
+
+    def _current_distance(self) -> float:
+        d = self.distance() if callable(self.distance) else self.distance
+        if self.noise_cm:
+            d += self.rng.gauss(0.0, self.noise_cm)
+        return max(0.0, d)
+
+    def _trigger(self, pin: int, value: int, t_ns: int) -> None:
+        if value:
+            return  # echo starts after the falling edge of the trigger
+        if t_ns < self._busy_until_ns or self.rng.random() < self.dropout:
+            return  # like the real module, ignore triggers while an echo is still out
+        stuck = self.rng.random() < self.stuck
+        # With nothing in range the module gives up and drops the line after ~38 ms
+        width = min(2 * self._current_distance() / SPEED_OF_SOUND_CM_S, MAX_ECHO_S)
+        rise_ns = t_ns + int(self.delay * 1e9)
+        fall_ns = rise_ns + int(width * 1e9)
+        self._busy_until_ns = fall_ns if not stuck else 2 ** 63
+
+        def echo():
+            # Wait in real time, but stamp edges with the exact simulated times
+            time.sleep(max(0.0, (rise_ns - time.monotonic_ns()) / 1e9))
+            self.backend.set_input(self.echo, 1, rise_ns)
+            if stuck:
+                return
+            time.sleep(max(0.0, (fall_ns - time.monotonic_ns()) / 1e9))
+            self.backend.set_input(self.echo, 0, fall_ns)
+
+        threading.Thread(target=echo, name="sim-echo", daemon=True).start()
+
+    def release(self) -> None:
+        """Pull a stuck echo line back low."""
+        self._busy_until_ns = 0
+        self.backend.set_input(self.echo, 0)
+
+
+def wandering_target(base_cm: float = 100.0, swing_cm: float = 40.0, period_s: float = 8.0) -> Callable[[], float]:
+    """Distance source for demos: a target drifting back and forth."""
+    t0 = time.monotonic()
+    return lambda: base_cm + swing_cm * math.sin(2 * math.pi * (time.monotonic() - t0) / period_s)
+
+
+def open_rangefinder(backend: Backend, trig: int, echo: int) -> Rangefinder:
+    """Rangefinder on trig/echo; on the simulator a SimulatedEcho answers instead of a sensor."""
+    if isinstance(backend, SimulatedBackend):
+        SimulatedEcho(backend, trig, echo, distance=wandering_target(), noise_cm=0.5, dropout=0.02)
+    return Rangefinder(backend, trig, echo)
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from backend.hal.base import Backend, EdgeCallback, BOTH, FALLING, IN, OUT, RISING
+
+# watcher(pin, value, t_ns), called after every simulated output write
+WriteWatcher = Callable[[int, int, int], None]
+
+
+class SimulatedBackend(Backend):
+    """
+    Pure-software pins for running and benchmarking on a plain Linux box.
+
+    Outputs just remember their value (and count writes). Inputs are driven by
+    set_input(), which fires edge callbacks like real GPIO would. watch_writes()
+    lets a simulated peripheral react to outputs, e.g. an echo after a trigger.
+    """
+
+    name = "sim"
+
+    def __init__(self, log_size: int = 1000):
+        self.modes: Dict[int, str] = {}
+        self.values: Dict[int, int] = {}
+        self.log = deque(maxlen=log_size)  # (t_ns, pin, value) for outputs
+        self.writes = 0
+        self.batches = 0
+        self._edges: Dict[int, tuple] = {}
+        self._watchers: Dict[int, List[WriteWatcher]] = {}
+        self._lock = threading.Lock()
+
+    def setup_output(self, pin: int, initial: int = 0) -> None:
+        self.modes[pin] = OUT
+        self.values[pin] = int(bool(initial))
+
+    def setup_input(self, pin: int, pull: Optional[str] = None) -> None:
+        self.modes[pin] = IN
+        self.values.setdefault(pin, 1 if pull == "up" else 0)
+
+    def read(self, pin: int) -> int:
+        return self.values.get(pin, 0)
+
+    def write(self, pin: int, value: int) -> None:
+        self.batches += 1
+        self._write(pin, value)
+
+    def write_many(self, values: Dict[int, int]) -> None:
+        if values:
+            self.batches += 1
+            for pin, value in values.items():
+                self._write(pin, value)
+
+    def _write(self, pin: int, value: int) -> None:
+        if self.modes.get(pin) != OUT:
+            raise ValueError(f"pin {pin} is not set up as an output")
+        value = int(bool(value))
+        t_ns = time.monotonic_ns()
+        with self._lock:
+            self.values[pin] = value
+            self.writes += 1
+            self.log.append((t_ns, pin, value))
+            watchers = list(self._watchers.get(pin, ()))
+        for watcher in watchers:
+            watcher(pin, value, t_ns)
+
+    def set_input(self, pin: int, value: int, t_ns: Optional[int] = None) -> None:
+        """
+        Drive a simulated input pin; fires matching edge callbacks. t_ns overrides
+        the edge timestamp so simulated peripherals can be exact about timing.
+        """
+        value = int(bool(value))
+        if t_ns is None:
+            t_ns = time.monotonic_ns()
+        with self._lock:
+            old = self.values.get(pin, 0)
+            self.values[pin] = value
+            edge = self._edges.get(pin)
+        if edge is None or old == value:
+            return
+        kind, callback = edge
+        if kind == BOTH or (kind == RISING and value) or (kind == FALLING and not value):
+            callback(pin, value, t_ns)
+
+    def add_edge_callback(self, pin: int, edge: str, callback: EdgeCallback) -> None:
+        self._edges[pin] = (edge, callback)
+
+    def remove_edge_callback(self, pin: int) -> None:
+        self._edges.pop(pin, None)
+
+    def watch_writes(self, pin: int, watcher: WriteWatcher) -> None:
+        self._watchers.setdefault(pin, []).append(watcher)
+
+    def cleanup(self) -> None:
+        self._edges.clear()
+        self._watchers.clear()
@@ -1,15 +1,22 @@
 import backend.chatbot as chatbot
+from backend.memory import ConversationMemory
+import backend.app_registry as app_registry
 import subprocess
 import os
+import sys
+import re
 import shlex
+import difflib
 
 
 
-APPS_DIR = "applications"
+APPS_DIR = "applications"  # path prefix the model uses in 'python3 applications/x.py'
+
+# Conversation history shared by every GUI turn, kept under a token budget
+memory = ConversationMemory(summarizer=lambda summary, turns: chatbot.summarize(chatbot.get_client(), summary, turns))
+
 def _discover_apps():
-        if not os.path.isdir(APPS_DIR):
-            return set()
-        return {f for f in os.listdir(APPS_DIR) if f.endswith(".py")}
+        return set(app_registry.registry.apps())
 
 def _maybe_extract_command(line: str):
         """
@@ -32,9 +39,93 @@ def _maybe_extract_command(line: str):
             return None
         return py, path
 
+# Extra names people use for installed apps (file name -> spoken names)
+APP_ALIASES = {
+        "oregon_trail.py": ["oregon trail", "the oregon trail", "oregon", "trail game"],
+        "weather.py": ["weather", "forecast", "weather report"],
+        "ultrasonic.py": ["ultrasonic", "sonar", "distance", "range finder", "distance sensor"],
+}
+_INTENT_RE = re.compile(
+        r"^(?:please\s+)?(?:can you\s+|could you\s+|would you\s+)?(?:please\s+)?"
+        r"(?:run|play|start|launch|open|load)\s+(?P<target>.+)$"
+)
+_FILLER_RE = re.compile(r"\b(?:the|a|an|my|game|app|application|program|please|for me|now)\b")
+
+def _compact(text):
+        """'Oregon-Trail.py ' -> 'oregontrail'"""
+        text = text.lower().strip()
+        if text.endswith(".py"):
+            text = text[:-3]
+        return re.sub(r"[^a-z0-9]", "", text)
+
+def route_intent(prompt, allowed_apps):
+        """
+        Local fast path for "run/play/start <app>" prompts. Returns the app file name
+        to launch, or None if the prompt isn't a launch request for an installed app.
+        """
+        text = re.sub(r"[^\w\s.\-]", " ", prompt.lower()).strip()
+        m = _INTENT_RE.match(re.sub(r"\s+", " ", text))
+        if not m:
+            return None
+        target = _compact(_FILLER_RE.sub(" ", m.group("target")))
+        if not target:
+            return None
+
+        names = {}
+        for fname in allowed_apps:
+            names[_compact(fname)] = fname
+            for alias in APP_ALIASES.get(fname, []):
+                names[_compact(alias)] = fname
+        if target in names:
+            return names[target]
+        close = difflib.get_close_matches(target, list(names), n=1, cutoff=0.8)
+        return names[close[0]] if close else None
+
+def requested_apps(resp, app, allowed_apps):
+        """
+        App file names the model asked to launch (structured 'app' field or a
+        'python3 applications/x.py' line in the reply), limited to installed apps.
+        """
+        # Structured app choice, else scan for runnable line(s) (fallback path)
+        commands = []
+        if app:
+            commands.append(("python3", f"{APPS_DIR}/{app}"))
+        for raw_line in resp.splitlines():
+            maybe = _maybe_extract_command(raw_line)
+            if maybe:
+                commands.append(maybe)
+
+        names = []
+        for py, path in commands:
+            # Safety: ensure the referenced app actually exists
+            fname = os.path.basename(path)
+            if fname not in allowed_apps:
+                print(f"[blocked: {fname} not in installed apps]")
+                continue
+            if fname not in names:
+                names.append(fname)
+        return names
+
+def _run_requested_apps(resp, app, allowed_apps):
+        """
+        Console path: confirms on stdin and runs each requested app to completion.
+        Returns an error string or None. The GUI uses requested_apps() + launcher instead.
+        """
+        for fname in requested_apps(resp, app, allowed_apps):
+            choice = input(f"Run 'python3 {APPS_DIR}/{fname}'? [y/N] ").strip().lower()
+            if choice != "y":
+                print("[cancelled]")
+                continue
+
+            try:
+                # Use absolute path to be explicit
+                abs_path = app_registry.registry.get(fname).path
+                subprocess.run([sys.executable, abs_path], check=False)
+            except Exception as e:
+                return(f"[error running command: {e}]")
+        return None
+
 def user_prompt(inputStr):
-        client = chatbot.loadAI()
-        memory = []
         allowed_apps = _discover_apps()
 
         print("Retro console online. Type 'stop' to exit.")
@@ -49,44 +140,88 @@ def user_prompt(inputStr):
 
                 
 
-                # Get the assistant's response and emotion
-                resp = chatbot.response(client, prompt, memory)
-                emo = chatbot.emotion(client, resp)
+                # "run oregon trail" and friends never need the LLM
+                app = route_intent(prompt, allowed_apps)
+                if app:
+                    resp = f"AFFIRMATIVE. LOADING {app} ... STAND BY."
+                    print(resp)
+                    memory.add_turn(prompt, resp)
+                    err = _run_requested_apps(resp, app, allowed_apps)
+                    if err:
+                        return err
+                    return [resp, "Happy"]
+
+                # Get the assistant's response, emotion and app in one round trip
+                client = chatbot.get_client()
+                result = chatbot.turn(client, prompt, memory.messages())
+                resp = result["reply"]
+                emo = result["emotion"]
                 print(f"[emotion: {emo}]")
+                print(f"[memory: {memory.last_saved} tokens saved]")
                 print(resp)
                 
 
                 # Update memory with both user and assistant turns
-                memory.append({"role": "user", "content": prompt})
-                memory.append({"role": "assistant", "content": resp})
-
-                # Scan for runnable line(s)
-                for raw_line in resp.splitlines():
-                    maybe = _maybe_extract_command(raw_line)
-                    if not maybe:
-                        continue
-                    py, path = maybe
-
-                    # Safety: ensure the referenced app actually exists
-                    fname = os.path.basename(path)
-                    if fname not in allowed_apps:
-                        print(f"[blocked: {fname} not in installed apps]")
-                        continue
-
-                    choice = input(f"Run '{py} {path}'? [y/N] ").strip().lower()
-                    if choice != "y":
-                        print("[cancelled]")
-                        continue
-
-                    try:
-                        # Use absolute path to be explicit
-                        abs_path = os.path.join(os.getcwd(), path)
-                        subprocess.run([py, abs_path], check=False)
-                    except Exception as e:
-                        return(f"[error running command: {e}]")
+                memory.add_turn(prompt, resp)
+
+                err = _run_requested_apps(resp, result["app"], allowed_apps)
+                if err:
+                    return err
                 return [resp, emo]
         except KeyboardInterrupt:
             return("\nInterrupted. Goodbye.")
 
+def user_prompt_stream(inputStr, on_token=None):
+        """
+        Streaming version of user_prompt. Calls on_token(text) for every piece of the
+        reply as it arrives; the emotion rides along in the same stream. Returns [resp, emo, apps]
+        where apps are the app file names to offer; nothing is launched or asked here.
+        """
+        allowed_apps = _discover_apps()
+
+        prompt = inputStr.strip()
+
+        app = route_intent(prompt, allowed_apps)
+        if app:
+            resp = f"AFFIRMATIVE. LOADING {app} ... STAND BY."
+            if on_token is not None:
+                on_token(resp)
+            memory.add_turn(prompt, resp)
+            return [resp, "Happy", [app]]
+
+        client = chatbot.get_client()
+        # Reply and emotion come from the same stream; no second round trip
+        result = chatbot.turn_stream(client, prompt, memory.messages(), on_token)
+        resp, emo = result["reply"], result["emotion"]
+        print(f"[emotion: {emo}]")
+        print(f"[memory: {memory.last_saved} tokens saved]")
+        print(resp)
+
+        memory.add_turn(prompt, resp)
+
+        return [resp, emo, requested_apps(resp, None, allowed_apps)]
+
+async def user_prompt_async(engine, inputStr, on_token=None, on_emotion=None):
+        """
+        asyncio version of user_prompt_stream, run on a chat_engine.AsyncChatEngine
+        (which shares this module's memory). Returns [resp, emo, apps] the same way.
+        """
+        allowed_apps = _discover_apps()
+
+        prompt = inputStr.strip()
+
+        app = route_intent(prompt, allowed_apps)
+        if app:
+            resp = f"AFFIRMATIVE. LOADING {app} ... STAND BY."
+            if on_token is not None:
+                on_token(resp)
+            memory.add_turn(prompt, resp)
+            return [resp, "Happy", [app]]
+
+        resp, emo = await engine.submit(prompt, on_token, on_emotion)
+        print(f"[memory: {memory.last_saved} tokens saved]")
+
+        return [resp, emo, requested_apps(resp, None, allowed_apps)]
+
 if __name__ == "__main__":
         user_prompt("")
@@ -0,0 +1,128 @@
+import codecs
+import os
+import subprocess
+import sys
+import threading
+from typing import Callable, Optional
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_worker.py")
+
+
+class RunningApp:
+    """Handle to a launched app: feed it input, stop it, or wait for it."""
+
+    def __init__(self, proc: subprocess.Popen, name: str,
+                 on_output: Optional[Callable[[str], None]],
+                 on_exit: Optional[Callable[[int], None]]):
+        self.proc = proc
+        self.name = name
+        self._on_output = on_output
+        self._on_exit = on_exit
+        self.bridge = None  # Qt object the callbacks emit through; lives exactly as long as this app
+        self._reader = threading.Thread(target=self._read, name=f"app-{name}", daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        # Stream stdout as it arrives (not per line, so input() prompts show up)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        fd = self.proc.stdout.fileno()
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text and self._on_output is not None:
+                self._on_output(text)
+        code = self.proc.wait()
+        if self._on_exit is not None:
+            self._on_exit(code)
+
+    def is_running(self) -> bool:
+        return self.proc.poll() is None
+
+    def send_input(self, text: str) -> None:
+        """Types a line into the app (answers its input() prompts)."""
+        if not self.is_running():
+            return
+        try:
+            self.proc.stdin.write((text + "\n").encode("utf-8"))
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self.is_running():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+
+    def stop_async(self, timeout: float = 2.0) -> None:
+        """stop() on a helper thread; on_exit still fires from the reader once the app is gone."""
+        threading.Thread(target=self.stop, args=(timeout,), name=f"stop-{self.name}", daemon=True).start()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        code = self.proc.wait(timeout)
+        self._reader.join(timeout)
+        return code
+
+
+class AppLauncher:
+    """
+    Starts apps without blocking the caller.
+
+    One spare interpreter (backend/app_worker.py) is kept running with the usual
+    imports already done, so a launch only has to hand it a path. A fresh spare is
+    warmed up after each app exits, when it won't compete with the app for the CPU.
+    """
+
+    def __init__(self, python: str = sys.executable):
+        self.python = python
+        self._spare: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen:
+        env = dict(os.environ, PYTHONUNBUFFERED="1")
+        return subprocess.Popen(
+            [self.python, "-u", WORKER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            env=env,
+        )
+
+    def prewarm(self) -> None:
+        """Makes sure a warm spare interpreter is waiting."""
+        with self._lock:
+            if self._spare is None or self._spare.poll() is not None:
+                self._spare = self._spawn()
+
+    def _take_spare(self) -> subprocess.Popen:
+        with self._lock:
+            proc, self._spare = self._spare, None
+        if proc is None or proc.poll() is not None:
+            proc = self._spawn()
+        return proc
+
+    def start(self, path: str,
+              on_output: Optional[Callable[[str], None]] = None,
+              on_exit: Optional[Callable[[int], None]] = None) -> RunningApp:
+        """Runs the app at `path` in the warm interpreter and returns immediately."""
+        proc = self._take_spare()
+        proc.stdin.write((os.path.abspath(path) + "\n").encode("utf-8"))
+        proc.stdin.flush()
+
+        def exited(code):
+            self.prewarm()
+            if on_exit is not None:
+                on_exit(code)
+
+        return RunningApp(proc, os.path.basename(path), on_output, exited)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spare is not None and self._spare.poll() is None:
+                self._spare.kill()
+            self._spare = None
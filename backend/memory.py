@@ -0,0 +1,109 @@
+import threading
+from typing import Callable, List, Dict, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token), good enough for budgeting."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def _fallback_summary(summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+    # Used when the summarizer fails: keep the start of each folded message
+    lines = [summary] if summary else []
+    lines += [f"{m['role']}: {m['content'][:120]}" for m in turns]
+    text = "\n".join(lines)
+    return text[-max_tokens * 4:]
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    # Keep the start of an oversized message; the gist is usually up front
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * 4 - 6].rstrip() + " [...]"
+
+
+class ConversationMemory:
+    """
+    Chat history that lives across turns but never outgrows a token budget.
+
+    Recent turns are sent verbatim. When they pass `max_tokens`, the oldest ones
+    are folded into a rolling summary (via `summarizer(old_summary, turns)`),
+    so the request size stays roughly constant however long the session runs.
+    A single message bigger than a quarter of the budget is clipped on the way in.
+    """
+
+    def __init__(self, max_tokens: int = 1200, summary_tokens: int = 200,
+                 summarizer: Optional[Callable[[str, List[Dict[str, str]]], str]] = None):
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.summary = ""
+        self.turns: List[Dict[str, str]] = []
+        self.raw_tokens = 0        # tokens of the full, uncompressed history
+        self.last_saved = 0        # tokens saved on the most recent messages() call
+        self.total_saved = 0       # tokens saved over the whole session
+        self._lock = threading.Lock()
+        self._compress_lock = threading.Lock()
+        self._generation = 0       # bumped by clear() so a running compression is dropped
+
+    def _recent_tokens(self) -> int:
+        return sum(estimate_tokens(m["content"]) for m in self.turns)
+
+    def add_turn(self, prompt: str, resp: str) -> None:
+        """Records one user/assistant exchange and compresses if over budget."""
+        # A single message can't take more than a quarter of the budget (one exchange, half)
+        limit = max(1, self.max_tokens // 4)
+        with self._lock:
+            for role, content in (("user", prompt), ("assistant", resp)):
+                self.raw_tokens += estimate_tokens(content)
+                self.turns.append({"role": role, "content": _clip(content, limit)})
+            over = self._recent_tokens() > self.max_tokens
+        if over:
+            self._compress()
+
+    def _compress(self) -> None:
+        # One compression at a time; readers only wait for the quick bookkeeping,
+        # never for the summarizer's round trip
+        with self._compress_lock:
+            with self._lock:
+                # Fold oldest exchanges until recent turns fit in half the budget,
+                # so we summarize every few turns instead of every turn
+                n, recent = 0, self._recent_tokens()
+                while len(self.turns) - n > 2 and recent > self.max_tokens // 2:
+                    recent -= sum(estimate_tokens(m["content"]) for m in self.turns[n:n + 2])
+                    n += 2
+                folded, summary, generation = self.turns[:n], self.summary, self._generation
+            if not folded:
+                return
+            try:
+                if self.summarizer is None:
+                    raise ValueError("no summarizer")
+                summary = self.summarizer(summary, folded).strip()
+            except Exception as e:
+                print(f"[memory summarize failed, truncating: {e}]")
+                summary = _fallback_summary(summary, folded, self.summary_tokens)
+            with self._lock:
+                if generation != self._generation:
+                    return  # cleared while we were summarizing
+                del self.turns[:n]
+                self.summary = summary
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages to send before the new prompt: summary (if any) + recent turns."""
+        with self._lock:
+            msgs = []
+            if self.summary:
+                msgs.append({"role": "system",
+                             "content": f"Summary of the earlier conversation: {self.summary}"})
+            msgs += list(self.turns)
+            sent = sum(estimate_tokens(m["content"]) for m in msgs)
+            self.last_saved = max(0, self.raw_tokens - sent)
+            self.total_saved += self.last_saved
+            return msgs
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.summary = ""
+            self.turns = []
+            self.raw_tokens = 0
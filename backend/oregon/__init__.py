@@ -0,0 +1,11 @@
+"""
+Oregon Trail simulation.
+
+engine holds the rules with no I/O; the terminal game in
+applications/oregon_trail.py is just a front end for it. save packs a game
+into a versioned binary save file and back.
+"""
+from backend.oregon.engine import (
+    Action, Event, GameState, Landmark, Offer, Party, Person, River, Supplies, Weather,
+    new_game, buy, step, play, score, legal_actions, steady_policy,
+)
@@ -0,0 +1,323 @@
+"""
+Vectorized Oregon Trail: N independent parties following one Strategy, with
+the whole party state in NumPy arrays and every daily rule applied as array
+operations driven by a numpy.random.Generator.
+
+The rules mirror engine.py (same tables, probabilities and ordering within a
+day), so the outcome distributions match engine.play() with strategy.policy;
+individual games don't, since the random streams differ.
+
+    python -m backend.oregon.batch -n 100000 --seed 1 --pace strenuous
+    python -m backend.oregon.batch -n 20000 --compare     # also time the per-party engine
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+from backend.oregon.engine import (
+    DISEASES, FERRY_FEE, LANDMARKS, PACE_HEALTH, PACE_MPD, RATION_HEALTH, RATION_MULTIPLIERS,
+    WEATHER_BY_MONTH, WINTER_DATE, play,
+)
+from backend.oregon.strategy import Strategy
+
+EPOCH = date(1848, 1, 1)  # days are counted from here
+WINTER_DAY = (WINTER_DATE - EPOCH).days
+TOTAL_MILES = 2000
+
+OUTCOMES = ("victory", "perished", "winter")
+CAUSES = ("starvation", "exhaustion", "dysentery", "cholera", "measles", "typhoid", "bad cold", "drowning")
+
+_MONTH = np.array([(EPOCH + timedelta(days=d)).month for d in range(400)])
+_MONTH_HEALTH = np.array([WEATHER_BY_MONTH.get(m, ("mild", 0))[1] for m in range(13)])
+_DISEASE_CAUSE = np.array([CAUSES.index(d) for d in DISEASES], dtype=np.int8)
+# One sentinel landmark past the end so next_landmark never indexes out of range
+_LM_MILE = np.array([lm.mile for lm in LANDMARKS] + [10 ** 9])
+_LM_RIVER = np.array([lm.river for lm in LANDMARKS] + [False])
+_LM_DEPTH_LO = np.array([lm.depth_ft[0] for lm in LANDMARKS] + [3])
+_LM_DEPTH_HI = np.array([lm.depth_ft[1] for lm in LANDMARKS] + [7])
+
+# Weather: 0 = the month's usual; otherwise one of the random days in engine.daily_weather
+RAIN, WINDY, VERY_COLD, VERY_HOT = 1, 2, 3, 4
+
+
+# The per-person draws run on every cell every day, so they come straight from raw
+# random bytes: ~10x cheaper than rng.random() for the same shape.
+
+def _coin(rng: np.random.Generator, shape) -> np.ndarray:
+    """Fair 0/1 per cell."""
+    size = int(np.prod(shape))
+    bits = np.unpackbits(np.frombuffer(rng.bytes((size + 7) // 8), dtype=np.uint8))
+    return bits[:size].reshape(shape)
+
+
+def _chance(rng: np.random.Generator, p: np.ndarray, shape) -> np.ndarray:
+    """True with probability p per cell (p resolved to 1/65536, plenty for these odds)."""
+    size = int(np.prod(shape))
+    u = np.frombuffer(rng.bytes(2 * size), dtype=np.uint16).reshape(shape)
+    return u < p * 65536
+
+
+@dataclass
+class BatchResult:
+    strategy: Strategy
+    outcome: np.ndarray      # (N,) index into OUTCOMES
+    end_day: np.ndarray      # (N,) days since EPOCH when the game ended
+    score: np.ndarray        # (N,) engine.score() at the end (meaningful for victories)
+    survivors: np.ndarray    # (N,)
+    death_cause: np.ndarray  # (N, party_size) index into CAUSES, -1 if alive
+    seconds: float = 0.0
+
+    @property
+    def parties(self) -> int:
+        return len(self.outcome)
+
+    def summary(self) -> Dict:
+        wins = self.outcome == 0
+        causes = Counter(self.death_cause[self.death_cause >= 0].tolist())
+        arrival = {}
+        if wins.any():
+            days = self.end_day[wins]
+            arrival = {f"p{q}": (EPOCH + timedelta(days=int(np.percentile(days, q)))).isoformat()
+                       for q in (10, 50, 90)}
+            months = Counter(_MONTH[np.minimum(days, len(_MONTH) - 1)].tolist())
+            arrival["by_month"] = {date(1848, m, 1).strftime("%b"): months[m] for m in sorted(months)}
+        return {
+            "strategy": self.strategy.as_dict(),
+            "parties": self.parties,
+            "win_rate": float(wins.mean()),
+            "outcomes": {name: int((self.outcome == i).sum()) for i, name in enumerate(OUTCOMES)},
+            "mean_score": float(self.score[wins].mean()) if wins.any() else 0.0,
+            "mean_survivors": float(self.survivors.mean()),
+            "deaths_per_party": float((self.death_cause >= 0).sum() / self.parties),
+            "death_causes": {CAUSES[i]: n for i, n in causes.most_common()},
+            "arrival": arrival,
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def simulate(strategy: Strategy, n: int, seed: Optional[int] = None,
+             rng: Optional[np.random.Generator] = None) -> BatchResult:
+    """Play n games of `strategy` at once."""
+    t0 = time.perf_counter()
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    start = strategy.new_game(random.Random(0))  # only the purchases are used; they don't depend on the rng
+    m = strategy.party_size
+
+    # Per-party state, one column per party (per-person arrays are (party_size, k)
+    # so per-party reductions and broadcasts run along long contiguous rows).
+    # Columns are dropped as games finish; `ids` maps them back.
+    ids = np.arange(n)
+    health = np.full((m, n), 100, dtype=np.int32)
+    alive = np.ones((m, n), dtype=bool)
+    cause = np.full((m, n), -1, dtype=np.int8)
+    food = np.full(n, start.supplies.food_lbs, dtype=np.int64)
+    ammo = np.full(n, start.supplies.ammo, dtype=np.int64)
+    money = np.full(n, start.party.money_cents, dtype=np.int64)
+    spares = np.repeat([[start.supplies.wheels], [start.supplies.axles], [start.supplies.tongues]], n, axis=1)
+    day = np.full(n, (start.date - EPOCH).days, dtype=np.int64)
+    miles = np.zeros(n, dtype=np.int64)
+    next_lm = np.zeros(n, dtype=np.int64)
+
+    out_outcome = np.full(n, -1, dtype=np.int8)
+    out_day = np.zeros(n, dtype=np.int64)
+    out_score = np.zeros(n, dtype=np.int64)
+    out_survivors = np.zeros(n, dtype=np.int64)
+    out_cause = np.full((n, m), -1, dtype=np.int8)
+
+    # Everything the strategy fixes for the whole trip
+    lo, hi = PACE_MPD[strategy.pace]
+    static_health = PACE_HEALTH[strategy.pace] + RATION_HEALTH[strategy.rations]
+    eat = RATION_MULTIPLIERS[strategy.rations]
+    ill_base = 0.02 + 0.01 * (strategy.pace == "grueling") + 0.01 * (strategy.rations in ("bare-bones", "meager"))
+    mishap_chance = 0.04 + 0.01 * (strategy.pace == "grueling")
+    slow_oxen = start.supplies.oxen < 6
+    living = alive.sum(axis=0)
+
+    while len(ids):
+        k = len(ids)
+
+        # Today's weather
+        weather = np.zeros(k, dtype=np.int64)
+        special = np.flatnonzero(rng.random(k) < 0.15)
+        weather[special] = rng.integers(RAIN, VERY_HOT + 1, len(special))
+        extreme = weather >= VERY_COLD
+        health_mod = _MONTH_HEALTH[_MONTH[day]] - extreme
+
+        # Strategy.policy, for every party at once
+        weakest = np.where(alive, health, 1000).min(axis=0)
+        resting = weakest < strategy.rest_below
+        hunting = ~resting & (food < strategy.hunt_below * living) & (ammo >= 10)
+        travelling = ~resting & ~hunting
+        active_day = ~resting  # travel and hunt days run the full health/event rules
+
+        # Random numbers are drawn only for the parties (or people) they apply to
+
+        # Travel
+        idx = np.flatnonzero(travelling)
+        step = rng.integers(lo, hi + 1, len(idx))
+        bad = (weather[idx] == RAIN) | extreme[idx]
+        step[bad] = (step[bad] * 0.85).astype(np.int64)
+        if slow_oxen:
+            step = (step * 0.9).astype(np.int64)
+        miles[idx] += np.maximum(5, step)
+
+        # Hunt
+        idx = np.flatnonzero(hunting)
+        if len(idx):
+            ammo[idx] = np.maximum(0, ammo[idx] - rng.integers(8, 21, len(idx)))
+            gain = rng.integers(40, 161, len(idx))
+            spoil = np.where((living[idx] <= 2) & (gain > 100),
+                             rng.integers(10, 41, len(idx)), rng.integers(0, 21, len(idx)))
+            food[idx] += np.maximum(0, gain - spoil)
+
+        # Rest
+        idx = np.flatnonzero(resting)
+        if len(idx):
+            heal = rng.integers(3, 8, (m, len(idx))) * alive[:, idx]
+            health[:, idx] = np.minimum(100, health[:, idx] + heal)
+
+        day += 1
+
+        # consume_food (every day)
+        need = np.rint(2 * eat * living).astype(np.int64)
+        hungry = np.flatnonzero(food < need)
+        food -= np.minimum(food, need)
+        if len(hungry):
+            short = need[hungry] - food[hungry]  # food is 0 there now
+            starve = (10 + short // np.maximum(1, living[hungry] * 2)) * alive[:, hungry]
+            health[:, hungry] = np.maximum(0, health[:, hungry] - starve)
+
+        # apply_daily_health
+        cells = active_day & alive
+        h = np.clip(health + (health_mod + static_health), 0, 100)
+        h -= (h > 0) & _coin(rng, (m, k))
+        health = np.where(cells, h, health)
+        died = cells & (health == 0)
+        cause[died] = np.broadcast_to(np.where(food == 0, 0, 1), (m, k))[died]
+        alive &= ~died
+
+        # random_events: illness
+        ill = active_day & alive & _chance(rng, ill_base + 0.01 * extreme, (m, k))
+        n_ill = int(ill.sum())
+        if n_ill:
+            disease = rng.integers(0, len(DISEASES), n_ill)
+            left = np.maximum(0, health[ill] - rng.integers(10, 26, n_ill))
+            health[ill] = left
+            died = np.zeros_like(ill)
+            died[ill] = left == 0
+            cause[died] = _DISEASE_CAUSE[disease[left == 0]]
+            alive &= ~died
+
+        # random_events: wagon mishaps
+        idx = np.flatnonzero(active_day & (rng.random(k) < mishap_chance))
+        if len(idx):
+            kind = rng.integers(0, 6, len(idx))
+            for part in range(3):  # wheel, axle, tongue: use a spare or lose a day
+                broke = idx[kind == part]
+                have = spares[part, broke] > 0
+                spares[part, broke[have]] -= 1
+                day[broke[~have]] += 1
+            lost = idx[kind == 3]
+            day[lost] += rng.integers(1, 4, len(lost)) - 1
+            water = idx[kind == 4]
+            health[:, water] = np.maximum(0, health[:, water] - 5 * alive[:, water])
+            thief = idx[kind == 5]
+            food[thief] -= np.minimum(food[thief], rng.integers(10, 41, len(thief)))
+
+        # Landmarks and river crossings
+        lm = next_lm
+        arrived = travelling & (miles >= _LM_MILE[lm])
+        next_lm = lm + arrived
+        idx = np.flatnonzero(arrived & _LM_RIVER[lm])
+        if len(idx):
+            r = len(idx)
+            deep = np.maximum(0, rng.integers(_LM_DEPTH_LO[lm[idx]], _LM_DEPTH_HI[lm[idx]] + 1) - 3)
+            ford_risk = 0.25 + 0.05 * deep
+            if strategy.river == "ford":
+                risk = ford_risk
+            elif strategy.river == "caulk":
+                risk = 0.10 + 0.03 * deep
+                day[idx] += 1
+            else:
+                ferry = money[idx] >= FERRY_FEE
+                money[idx] -= FERRY_FEE * ferry
+                risk = np.where(ferry, 0.04 + 0.02 * deep, ford_risk)
+            idx = idx[rng.random(r) < risk]  # swamped
+            if len(idx):
+                s = len(idx)
+                food[idx] -= np.minimum(food[idx], rng.integers(20, 101, s))
+                wet = idx[(ammo[idx] > 0) & (rng.random(s) < 0.5)]
+                ammo[wet] -= np.minimum(ammo[wet], rng.integers(10, 51, len(wet)))
+                hurt = alive[:, idx] & (rng.random((m, s)) < 0.3)
+                sub = health[:, idx]
+                sub[hurt] = np.maximum(0, sub[hurt] - rng.integers(5, 21, int(hurt.sum())))
+                health[:, idx] = sub
+                drowned = hurt & (sub == 0)
+                sub_cause = cause[:, idx]
+                sub_cause[drowned] = CAUSES.index("drowning")
+                cause[:, idx] = sub_cause
+                alive[:, idx] &= ~drowned
+
+        # End of game checks, in engine order
+        living = alive.sum(axis=0)
+        won = miles >= TOTAL_MILES
+        perished = ~won & (living == 0)
+        winter = ~won & ~perished & (day >= WINTER_DAY)
+        done = won | perished | winter
+        if done.any():
+            done_ids = ids[done]
+            out_outcome[done_ids] = np.where(won[done], 0, np.where(perished[done], 1, 2))
+            out_day[done_ids] = day[done]
+            out_score[done_ids] = money[done] // 100 + food[done] // 5 + 50 * living[done]
+            out_survivors[done_ids] = living[done]
+            out_cause[done_ids] = cause[:, done].T
+            keep = ~done
+            ids, living, day, miles, next_lm = ids[keep], living[keep], day[keep], miles[keep], next_lm[keep]
+            food, ammo, money = food[keep], ammo[keep], money[keep]
+            health, alive, cause, spares = health[:, keep], alive[:, keep], cause[:, keep], spares[:, keep]
+
+    return BatchResult(strategy, out_outcome, out_day, out_score, out_survivors, out_cause,
+                       seconds=time.perf_counter() - t0)
+
+
+def simulate_scalar(strategy: Strategy, n: int, seed: int = 0) -> Dict:
+    """Same experiment through the per-party engine, for comparison and timing."""
+    t0 = time.perf_counter()
+    wins = 0
+    for i in range(n):
+        rng = random.Random(seed * 1_000_003 + i)
+        gs, _ = play(strategy.new_game(rng), strategy.policy, rng)
+        wins += gs.victory
+    return {"parties": n, "win_rate": wins / n, "seconds": round(time.perf_counter() - t0, 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many Oregon Trail parties with one strategy.")
+    parser.add_argument("-n", type=int, default=10000, help="number of parties")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--compare", action="store_true", help="also run the per-party engine and compare")
+    for name, default in Strategy().as_dict().items():
+        parser.add_argument("--" + name.replace("_", "-"), type=type(default), default=default)
+    args = parser.parse_args()
+    strategy = Strategy(**{k: getattr(args, k) for k in Strategy().as_dict()})
+
+    result = simulate(strategy, args.n, args.seed)
+    summary = result.summary()
+    if args.compare:
+        n = min(args.n, 5000)
+        scalar = simulate_scalar(strategy, n, args.seed or 0)
+        summary["engine"] = scalar
+        summary["speedup"] = round((scalar["seconds"] / n) / (result.seconds / args.n), 1)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
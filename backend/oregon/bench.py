@@ -0,0 +1,327 @@
+"""
+Benchmarks for the scalar Oregon Trail engine (the rules behind
+applications/oregon_trail.py), with a stored baseline to catch slowdowns.
+
+Micro benchmarks time one hot function at a time on states prepared outside the
+timed loop: a travel day, random_events, consume_food, apply_daily_health,
+Party.living_members() / size(), and state clone / snapshot / restore. Macro
+benchmarks play whole scripted games at fixed seeds. Every run uses the same
+seeds, so the work done is identical from run to run and only the clock varies.
+
+Results are written as JSON. Benchmarks are compared by their best (min) time
+over the repeats, the least noisy number. The baseline is recorded from several
+independent runs (--runs) and keeps, per benchmark, the median of those runs'
+min times and how far apart they were (`noise`). A benchmark is a regression,
+and the exit status 1, when it is slower than the baseline by more than
+--threshold, widened by the measured noise up to MAX_NOISE_ALLOWANCE at most.
+--save refuses to write a baseline noisier than --threshold; record it on a
+quiet machine. Macro games also record a checksum of their outcomes, so a
+change that alters the game itself (not just its speed) gets flagged too.
+
+    python -m backend.oregon.bench                      # run, compare with bench_baseline.json
+    python -m backend.oregon.bench --quick --out run.json
+    python -m backend.oregon.bench --save               # after an intended change, on the reference machine
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.oregon.engine import (
+    LANDMARKS, TRAVEL, Action, Event, GameState, apply_daily_health, consume_food, play,
+    random_events, steady_policy, step,
+)
+from backend.oregon.strategy import Strategy
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+FORMAT = 2
+SEED = 1848
+NOISE_MARGIN = 1.5          # allowed slowdown, in multiples of the baseline's run-to-run spread...
+MAX_NOISE_ALLOWANCE = 0.25  # ...but never more than this, or the gate stops catching anything
+
+# A 5-person party past the Kaw River with nothing but open prairie for the next 500 miles,
+# so a batch of travel days never runs into a river, a landmark decision or the end
+_TRAVEL_DAYS = 20
+
+
+def _trail_state(seed: int = SEED) -> GameState:
+    rng = random.Random(seed)
+    gs = Strategy(profession="a", food_lbs=2000).new_game(rng)
+    gs.trail_miles = LANDMARKS[0].mile + 10
+    gs.next_landmark_idx = 1
+    return gs
+
+
+def _states(n: int) -> List[GameState]:
+    snap = _trail_state().snapshot()
+    return [GameState.restore(snap) for _ in range(n)]
+
+
+def _timed(loop: Callable[[], None]) -> float:
+    gc.disable()  # same as timeit: collections land at random and swamp small timings
+    try:
+        t = time.perf_counter()
+        loop()
+        return time.perf_counter() - t
+    finally:
+        gc.enable()
+
+# ----------------------------- Benchmarks -----------------------------
+#
+# Each takes the number of operations to time and returns (seconds, ops, checksum).
+# checksum is "" for micro benchmarks.
+
+def bench_travel_day(n: int):
+    games = _states(max(1, n // _TRAVEL_DAYS))
+    rng, travel = random.Random(SEED), Action(TRAVEL)
+
+    def loop():
+        for gs in games:
+            for _ in range(_TRAVEL_DAYS):
+                step(gs, travel, rng, copy=False)
+    return _timed(loop), len(games) * _TRAVEL_DAYS, ""
+
+
+def bench_travel_day_copy(n: int):
+    games = _states(max(1, n // _TRAVEL_DAYS))
+    rng, travel = random.Random(SEED), Action(TRAVEL)
+
+    def loop():
+        for gs in games:
+            for _ in range(_TRAVEL_DAYS):
+                gs, _ = step(gs, travel, rng)
+    return _timed(loop), len(games) * _TRAVEL_DAYS, ""
+
+
+def _per_state(fn: Callable[[GameState, random.Random, List[Event]], None]):
+    def bench(n: int):
+        games, rng, events = _states(n), random.Random(SEED), []
+
+        def loop():
+            for gs in games:
+                fn(gs, rng, events)
+        return _timed(loop), n, ""
+    return bench
+
+
+def _per_party(method: str):
+    def bench(n: int):
+        call = getattr(_trail_state().party, method)
+
+        def loop():
+            for _ in range(n):
+                call()
+        return _timed(loop), n, ""
+    return bench
+
+
+def bench_clone(n: int):
+    gs = _trail_state()
+    return _timed(lambda: [gs.clone() for _ in range(n)]), n, ""
+
+
+def bench_snapshot(n: int):
+    gs = _trail_state()
+    return _timed(lambda: [gs.snapshot() for _ in range(n)]), n, ""
+
+
+def bench_restore(n: int):
+    snap = _trail_state().snapshot()
+    return _timed(lambda: [GameState.restore(snap) for _ in range(n)]), n, ""
+
+
+def _games(strategy: Strategy, policy: Optional[Callable] = None):
+    def bench(n: int):
+        outcomes = []
+
+        def loop():
+            for seed in range(n):
+                rng = random.Random(seed)
+                gs = strategy.new_game(rng)
+                _, steps = play(gs, policy or strategy.policy, rng)
+                outcomes.append((gs.victory, gs.trail_miles, gs.date.toordinal(), steps,
+                                 gs.party.money_cents, gs.supplies.food_lbs,
+                                 tuple(p.health for p in gs.party.members)))
+        seconds = _timed(loop)
+        return seconds, n, hashlib.sha1(repr(outcomes).encode()).hexdigest()[:16]
+    return bench
+
+
+# name -> (function, ops per run, unit)
+BENCHMARKS: Dict[str, Tuple[Callable, int, str]] = {
+    "travel_day": (bench_travel_day, 20000, "day"),
+    "travel_day_copy": (bench_travel_day_copy, 20000, "day"),
+    "random_events": (_per_state(lambda gs, rng, ev: random_events(gs, gs.weather, rng, ev)), 20000, "call"),
+    "consume_food": (_per_state(lambda gs, rng, ev: consume_food(gs)), 20000, "call"),
+    "apply_daily_health": (_per_state(lambda gs, rng, ev: apply_daily_health(gs, gs.weather, rng, ev)), 20000, "call"),
+    "living_members": (_per_party("living_members"), 100000, "call"),
+    "party_size": (_per_party("size"), 100000, "call"),
+    "clone": (bench_clone, 50000, "call"),
+    "snapshot": (bench_snapshot, 50000, "call"),
+    "restore": (bench_restore, 50000, "call"),
+    "game_steady_policy": (_games(Strategy(profession="a"), steady_policy), 200, "game"),
+    "game_grueling_meager": (_games(Strategy(profession="a", pace="grueling", rations="meager")), 200, "game"),
+}
+
+
+def run(names: Sequence[str] = tuple(BENCHMARKS), repeat: int = 5, scale: float = 1.0,
+        progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """Run the benchmarks and return the results document written as JSON."""
+    results = {}
+    for name in names:
+        fn, ops, unit = BENCHMARKS[name]
+        ops = max(1, int(ops * scale))
+        fn(max(1, ops // 10))  # warm up
+        times, checksum = [], ""
+        for _ in range(repeat):
+            seconds, done, checksum = fn(ops)
+            times.append(seconds * 1e9 / done)
+        results[name] = {"unit": unit, "ops": done, "repeat": repeat,
+                         "min_ns": round(min(times), 1), "median_ns": round(statistics.median(times), 1),
+                         "checksum": checksum}
+        if progress is not None:
+            progress(f"{name:22s} {results[name]['min_ns']:>12,.0f} ns/{unit}")
+    return {
+        "format": FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "scale": scale,
+        "results": results,
+    }
+
+
+def record_baseline(names: Sequence[str] = tuple(BENCHMARKS), runs: int = 5, repeat: int = 7,
+                    scale: float = 1.0, progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    A baseline from several independent runs: per benchmark the median of the
+    runs' min times, and noise = (slowest - fastest run's min) / that median.
+    """
+    docs = []
+    for i in range(runs):
+        if progress is not None:
+            progress(f"-- baseline run {i + 1}/{runs}")
+        docs.append(run(names, repeat, scale, progress))
+    baseline = dict(docs[-1], runs=runs)
+    for name, res in docs[-1]["results"].items():
+        mins = [d["results"][name]["min_ns"] for d in docs]
+        mid = statistics.median(mins)
+        baseline["results"][name] = dict(res, min_ns=round(mid, 1),
+                                         median_ns=statistics.median(d["results"][name]["median_ns"] for d in docs),
+                                         noise=round((max(mins) - min(mins)) / mid, 3))
+    return baseline
+
+
+def noisy(baseline: Dict, threshold: float) -> List[str]:
+    """Benchmarks whose run-to-run noise is above threshold."""
+    return [name for name, res in baseline["results"].items() if res.get("noise", 0.0) > threshold]
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.10) -> Tuple[List[str], List[str]]:
+    """(report lines, names of regressed benchmarks) for current against baseline."""
+    lines, regressed = [], []
+    base = baseline.get("results", {})
+    if baseline.get("python") != current.get("python") or baseline.get("machine") != current.get("machine"):
+        lines.append(f"note: baseline is from Python {baseline.get('python')} on {baseline.get('machine')}; "
+                     "timings across machines are only roughly comparable")
+    for name, res in current["results"].items():
+        old = base.get(name)
+        if old is None:
+            lines.append(f"{name:22s} {res['min_ns']:>12,.0f} ns   (new, no baseline)")
+            continue
+        ratio = res["min_ns"] / old["min_ns"]
+        allowed = max(threshold, min(MAX_NOISE_ALLOWANCE, NOISE_MARGIN * old.get("noise", 0.0)))
+        flag = ""
+        if ratio > 1 + allowed:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        elif ratio < 1 - allowed:
+            flag = "  faster"
+        if res["checksum"] and res["ops"] == old["ops"] and res["checksum"] != old.get("checksum"):
+            flag += "  OUTCOMES CHANGED"
+            if name not in regressed:
+                regressed.append(name)
+        lines.append(f"{name:22s} {old['min_ns']:>12,.0f} -> {res['min_ns']:>12,.0f} ns/{res['unit']}"
+                     f"  x{ratio:.2f} (gate x{1 + allowed:.2f}){flag}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Oregon Trail engine against a stored baseline.")
+    parser.add_argument("--only", help="comma-separated benchmark names (default: all)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--quick", action="store_true", help="a tenth of the work, for a smoke run")
+    parser.add_argument("--out", help="write the results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before failing (0.10 = 10%%)")
+    parser.add_argument("--save", "--update-baseline", dest="save", action="store_true",
+                        help="record and store a new baseline (refused if noisier than --threshold)")
+    parser.add_argument("--runs", type=int, default=5, help="independent runs behind a new baseline")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    scale = 0.1 if args.quick else 1.0
+
+    def progress(line: str) -> None:
+        print(line, file=sys.stderr)
+
+    if args.save:
+        current = record_baseline(names, args.runs, args.repeat, scale, progress)
+    else:
+        current = run(names, args.repeat, scale, progress)
+    text = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.save:
+        loud = noisy(current, args.threshold)
+        if loud:
+            for name in loud:
+                print(f"{name:22s} runs differ by {current['results'][name]['noise']:.0%}")
+            print(f"baseline not written: noise above the {args.threshold:.0%} threshold; "
+                  "record it on a quieter machine (or with more --repeat)")
+            return 1
+        if args.only and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                stored = json.load(f)
+            # Only replace the benchmarks that were run
+            current = dict(current, results=dict(stored.get("results", {}), **current["results"]))
+            text = json.dumps(current, indent=2)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save to store one")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    lines, regressed = compare(current, baseline, args.threshold)
+    print("\n".join(lines))
+    if regressed:
+        print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,625 @@
+"""
+Oregon Trail rules with no I/O.
+
+step(state, action, rng) -> (new_state, events). The state is plain data, every
+random draw goes through the rng passed in (random.Random(seed) replays a game
+exactly), and everything the player should hear about comes back as Event
+objects instead of print() calls. applications/oregon_trail.py is the terminal
+front end; simulations and bots drive the same functions directly.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+# ----------------------------- Content data -----------------------------
+
+PROFESSIONS = {
+    "a": ("Banker", 160000),     # $1600.00
+    "b": ("Carpenter", 80000),   # $800.00
+    "c": ("Farmer", 40000),      # $400.00
+}
+
+RATION_MULTIPLIERS = {
+    "bare-bones": 0.5,
+    "meager": 0.75,
+    "normal": 1.0,
+    "filling": 1.25,
+}
+
+PACE_MPD = {  # base miles per day by pace
+    "steady": (12, 18),
+    "strenuous": (16, 24),
+    "grueling": (20, 30),
+}
+
+PACE_HEALTH = {"steady": 0, "strenuous": -1, "grueling": -2}
+RATION_HEALTH = {"bare-bones": -2, "meager": -1, "normal": 0, "filling": 1}
+
+WEATHER_BY_MONTH = {
+    3: ("cold", -2),     # (label, health modifier per day)
+    4: ("chilly", -1),
+    5: ("mild", 0),
+    6: ("warm", -1),
+    7: ("hot", -2),
+    8: ("hot", -2),
+    9: ("cool", -1),
+    10: ("cold", -2),
+}
+
+STORE_PRICES = {
+    # cents per unit
+    "oxen": 2500,       # $25 per ox
+    "food_lbs": 20,     # $0.20 / lb
+    "ammo": 5,          # $0.05 / bullet
+    "clothing": 1000,   # $10 / set
+    "wheel": 1500,      # $15
+    "axle": 1500,
+    "tongue": 1500,
+}
+
+class Landmark(NamedTuple):
+    name: str
+    mile: int
+    river: bool = False
+    depth_ft: Tuple[int, int] = (3, 7)  # range a river's depth is rolled from
+
+# One shared, immutable route; game states only keep an index into it
+LANDMARKS = (
+    Landmark("Kaw River Crossing", 102, True, (2, 6)),
+    Landmark("Fort Kearny", 623),
+    Landmark("Chimney Rock", 664),
+    Landmark("Fort Laramie", 788),
+    Landmark("Independence Rock", 940),
+    Landmark("South Pass", 1092),
+    Landmark("Green River Crossing", 1195, True, (3, 8)),
+    Landmark("Fort Hall", 1403),
+    Landmark("Snake River Crossing", 1640, True, (4, 10)),
+    Landmark("Fort Boise", 1753),
+    Landmark("The Dalles", 1965),
+)
+
+DISEASES = ["dysentery", "exhaustion", "cholera", "measles", "typhoid", "bad cold"]
+MISHAPS = ["broken wheel", "broken axle", "broken tongue", "lost the trail", "bad water", "thief at night"]
+WINTER_DATE = date(1848, 12, 1)  # still on the trail by then -> game over
+
+RIVER_OPTIONS = {
+    "ford": "Attempt to ford (risky)",
+    "caulk": "Caulk wagon & float (safer, lose a day)",
+    "ferry": "Find a ferry (cost money, safer)",
+    "wait": "Wait and rest a day",
+}
+FERRY_FEE = 500  # $5
+
+# ----------------------------- Game structures -----------------------------
+#
+# The mutable state is slotted dataclasses holding only ints and strings; anything
+# that hangs off it (weather, a river ahead, a trade offer) is an immutable tuple,
+# so copies can share those. GameState.snapshot() flattens the lot into one tuple
+# for undo stacks and search, and save.py packs it into a binary save file.
+
+class Weather(NamedTuple):
+    label: str
+    health_mod: int  # health change per day
+
+class River(NamedTuple):
+    name: str
+    depth: int  # feet, rolled on arrival
+    width: int  # feet
+    depth_ft: Tuple[int, int] = (3, 7)
+
+class Offer(NamedTuple):
+    give: Tuple[str, int]  # what the trader gives: (TRADE_LABELS key, qty)
+    want: Tuple[str, int]  # and wants for it
+
+@dataclass(slots=True)
+class Person:
+    name: str
+    alive: bool = True
+    health: int = 100  # 0-100
+
+@dataclass(slots=True)
+class Party:
+    leader: str
+    members: List[Person]
+    money_cents: int
+    pace: str = "steady"     # 'steady','strenuous','grueling'
+    rations: str = "normal"  # 'bare-bones','meager','normal','filling'
+
+    def living_members(self) -> List[Person]:
+        return [p for p in self.members if p.alive]
+
+    def size(self) -> int:
+        return len(self.living_members())
+
+    def clone(self) -> "Party":
+        return Party(self.leader, [Person(p.name, p.alive, p.health) for p in self.members],
+                     self.money_cents, self.pace, self.rations)
+
+@dataclass(slots=True)
+class Supplies:
+    oxen: int = 6           # head of oxen
+    food_lbs: int = 0
+    ammo: int = 0           # bullets
+    clothing: int = 0       # sets
+    wheels: int = 2
+    axles: int = 2
+    tongues: int = 2
+
+    def clone(self) -> "Supplies":
+        return Supplies(self.oxen, self.food_lbs, self.ammo, self.clothing,
+                        self.wheels, self.axles, self.tongues)
+
+@dataclass(slots=True)
+class GameState:
+    trail_miles: int = 0
+    total_miles: int = 2000  # Independence, MO to Willamette Valley, OR
+    date: date = date(1848, 3, 1)  # Start Mar 1, 1848
+    party: Party = None  # type: ignore
+    supplies: Supplies = field(default_factory=Supplies)
+    next_landmark_idx: int = 0
+    game_over: bool = False
+    victory: bool = False
+    weather: Weather = Weather("mild", 0)  # today's
+    pending_river: Optional[River] = None  # set on arrival at a river, cleared by a CROSS action
+    pending_trade: Optional[Offer] = None  # set by TRADE, cleared by ACCEPT/DECLINE
+
+    @property
+    def landmarks(self) -> Tuple[Landmark, ...]:
+        return LANDMARKS
+
+    def clone(self) -> "GameState":
+        # Dates and the tuples hanging off the state are immutable, so they are shared
+        return GameState(self.trail_miles, self.total_miles, self.date, self.party.clone(),
+                         self.supplies.clone(), self.next_landmark_idx,
+                         self.game_over, self.victory, self.weather,
+                         self.pending_river, self.pending_trade)
+
+    def snapshot(self) -> tuple:
+        """
+        The whole state as one flat, hashable tuple. Cheap to take, nothing in it can
+        change under you, and equal states give equal snapshots (handy for undo
+        stacks and as search keys). GameState.restore() turns it back into a state.
+        """
+        p, s = self.party, self.supplies
+        return (self.trail_miles, self.total_miles, self.date, self.next_landmark_idx,
+                self.game_over, self.victory, self.weather, self.pending_river, self.pending_trade,
+                p.leader, p.money_cents, p.pace, p.rations,
+                tuple([(m.name, m.alive, m.health) for m in p.members]),
+                s.oxen, s.food_lbs, s.ammo, s.clothing, s.wheels, s.axles, s.tongues)
+
+    @classmethod
+    def restore(cls, snap: tuple) -> "GameState":
+        (trail_miles, total_miles, day, next_lm, game_over, victory, weather, river, offer,
+         leader, money, pace, rations, members, *supplies) = snap
+        party = Party(leader, [Person(*m) for m in members], money, pace, rations)
+        return cls(trail_miles, total_miles, day, party, Supplies(*supplies), next_lm,
+                   game_over, victory, weather, river, offer)
+
+    @property
+    def finished(self) -> bool:
+        return self.game_over or self.victory
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    kind: str          # 'travel', 'illness', 'death', 'mishap', 'landmark', 'river', 'trade', ...
+    text: str          # what the terminal game prints
+    who: str = ""      # person affected, if any
+    detail: str = ""   # disease / mishap / cause of death
+    amount: int = 0    # miles, lbs, health lost, ...
+
+# Action kinds
+TRAVEL = "travel"
+REST = "rest"
+HUNT = "hunt"
+PACE = "pace"          # choice: a PACE_MPD key
+RATIONS = "rations"    # choice: a RATION_MULTIPLIERS key
+TRADE = "trade"        # ask for an offer
+ACCEPT = "accept"      # take the pending offer
+DECLINE = "decline"
+CAMP = "camp"          # pass a day without travelling
+CROSS = "cross"        # choice: a RIVER_OPTIONS key
+QUIT = "quit"
+
+@dataclass(frozen=True, slots=True)
+class Action:
+    kind: str
+    choice: Optional[str] = None
+
+# ----------------------------- Helpers -----------------------------
+
+def money_to_str(cents: int) -> str:
+    dollars = cents // 100
+    cents_rem = cents % 100
+    return f"${dollars:,}.{cents_rem:02d}"
+
+def clamp(v: int, a: int, b: int) -> int:
+    return max(a, min(b, v))
+
+def new_game(rng: random.Random, profession: str = "c", leader: str = "Leader",
+             members: Tuple[str, ...] = (), start_month: int = 3) -> GameState:
+    """A party at Independence with the profession's money and no supplies bought yet."""
+    _, money = PROFESSIONS[profession]
+    people = [Person(leader or "Leader")] + [Person(m) for m in members[:4]]
+    gs = GameState(date=date(1848, start_month, 1),
+                   party=Party(leader=people[0].name, members=people, money_cents=money),
+                   supplies=Supplies(oxen=0))
+    gs.weather = daily_weather(gs.date, rng)
+    return gs
+
+def buy(gs: GameState, item: str, qty: int, partial: bool = True) -> int:
+    """
+    Buy qty of a STORE_PRICES item. With partial=True buys as many as the money
+    allows; otherwise buys nothing if it can't afford all of them. Returns the
+    quantity bought.
+    """
+    price = STORE_PRICES[item]
+    if qty * price > gs.party.money_cents:
+        if not partial:
+            return 0
+        qty = gs.party.money_cents // price
+    qty = max(0, qty)
+    gs.party.money_cents -= qty * price
+    attr = {"wheel": "wheels", "axle": "axles", "tongue": "tongues"}.get(item, item)
+    setattr(gs.supplies, attr, getattr(gs.supplies, attr) + qty)
+    return qty
+
+def score(gs: GameState) -> int:
+    survivors = sum(p.alive for p in gs.party.members)
+    return gs.party.money_cents // 100 + gs.supplies.food_lbs // 5 + 50 * survivors
+
+# ----------------------------- Simulation logic -----------------------------
+
+def daily_weather(d: date, rng: random.Random) -> Weather:
+    label, health_mod = WEATHER_BY_MONTH.get(d.month, ("mild", 0))
+    # Small randomness
+    if rng.random() < 0.15:
+        label = rng.choice(["rain", "windy", "very cold", "very hot"])
+        if label in ("very cold", "very hot"):
+            health_mod -= 1
+    return Weather(label, health_mod)
+
+def consume_food(gs: GameState) -> None:
+    # 2 lbs per person per day at normal rations (this used to multiply by 16 as if
+    # counting ounces, which ate a 1000 lb wagon empty in a week)
+    size = gs.party.size()
+    need = round(2 * RATION_MULTIPLIERS[gs.party.rations] * size)
+    if gs.supplies.food_lbs >= need:
+        gs.supplies.food_lbs -= need
+    else:
+        # Starvation: reduce health of all living members more
+        shortage = need - gs.supplies.food_lbs
+        gs.supplies.food_lbs = 0
+        for p in gs.party.living_members():
+            p.health = clamp(p.health - (10 + shortage // max(1, size * 2)), 0, 100)
+
+def travel_miles_for_day(gs: GameState, weather: Weather, rng: random.Random) -> int:
+    lo, hi = PACE_MPD[gs.party.pace]
+    miles = rng.randint(lo, hi)
+
+    # Weather effects
+    if weather.label in ("rain", "very cold", "very hot"):
+        miles = int(miles * 0.85)
+    if gs.supplies.oxen < 6:
+        miles = int(miles * 0.9)
+
+    return max(5, miles)
+
+def _kill(p: Person, cause: str, text: str, events: List[Event]) -> None:
+    p.alive = False
+    events.append(Event("death", text, who=p.name, detail=cause))
+
+def apply_daily_health(gs: GameState, weather: Weather, rng: random.Random, events: List[Event]) -> None:
+    # Pace costs health, better rations give a little back
+    delta = weather.health_mod + PACE_HEALTH[gs.party.pace] + RATION_HEALTH[gs.party.rations]
+    for p in gs.party.living_members():
+        health = min(100, max(0, p.health + delta))
+        # Small fatigue (a coin flip; cheaper than randint(0, 1) on this hot path)
+        if health and rng.random() < 0.5:
+            health -= 1
+        p.health = health
+        if health == 0:
+            cause = "starvation" if gs.supplies.food_lbs == 0 else "exhaustion"
+            _kill(p, cause, f"☠ {p.name} has died.", events)
+
+def random_events(gs: GameState, weather: Weather, rng: random.Random, events: List[Event]) -> None:
+    """Random daily events that can help or hurt."""
+    # Illness chance per person, higher under harsh conditions
+    ill_base = 0.02
+    if gs.party.pace == "grueling": ill_base += 0.01
+    if gs.party.rations in ("bare-bones", "meager"): ill_base += 0.01
+    if weather.label in ("very cold", "very hot"): ill_base += 0.01
+
+    for p in gs.party.living_members():
+        if rng.random() < ill_base:
+            disease = rng.choice(DISEASES)
+            loss = rng.randint(10, 25)
+            p.health = clamp(p.health - loss, 0, 100)
+            events.append(Event("illness", f"⚕ {p.name} fell ill with {disease} (-{loss} health).",
+                                who=p.name, detail=disease, amount=loss))
+            if p.health == 0:
+                _kill(p, disease, f"☠ {p.name} has died of {disease}.", events)
+
+    # Wagon mishaps
+    mishap_chance = 0.04
+    if gs.party.pace == "grueling": mishap_chance += 0.01
+    if rng.random() >= mishap_chance:
+        return
+    mishap = rng.choice(MISHAPS)
+    if mishap in ("broken wheel", "broken axle", "broken tongue"):
+        part = mishap.split()[1]
+        attr = part + "s"
+        if getattr(gs.supplies, attr) > 0:
+            setattr(gs.supplies, attr, getattr(gs.supplies, attr) - 1)
+            text = f"🛠 A wagon {part} broke. You used a spare."
+        else:
+            text = f"🛠 A wagon {part} broke, and you have no spare. You lost 2 days to repair."
+            gs.date += timedelta(days=1)  # extra day lost (on top of daily increment)
+        events.append(Event("mishap", text, detail=mishap))
+    elif mishap == "lost the trail":
+        lost_days = rng.randint(1, 3)
+        gs.date += timedelta(days=lost_days - 1)  # -1 because the day advances anyway
+        events.append(Event("mishap", f"🧭 You got lost. You lost {lost_days} day(s).",
+                            detail=mishap, amount=lost_days))
+    elif mishap == "bad water":
+        for p in gs.party.living_members():
+            p.health = clamp(p.health - 5, 0, 100)
+        events.append(Event("mishap", "💧 Bad water made everyone feel worse (-5 health).", detail=mishap, amount=5))
+    elif mishap == "thief at night":
+        stolen = min(gs.supplies.food_lbs, rng.randint(10, 40))
+        gs.supplies.food_lbs -= stolen
+        events.append(Event("mishap", f"🕵 A thief stole {stolen} lbs of food.", detail=mishap, amount=stolen))
+
+def check_landmark(gs: GameState, events: List[Event]) -> Optional[Landmark]:
+    if gs.next_landmark_idx >= len(LANDMARKS):
+        return None
+    lm = LANDMARKS[gs.next_landmark_idx]
+    if gs.trail_miles >= lm.mile:
+        events.append(Event("landmark", f"\n=== You reached {lm.name} (mile {lm.mile}) ===", detail=lm.name))
+        gs.next_landmark_idx += 1
+        return lm
+    return None
+
+def _river_ahead(gs: GameState, lm, rng: random.Random, events: List[Event]) -> None:
+    """Roll the river at lm (a Landmark, or the River being waited out)."""
+    depth = rng.randint(*lm.depth_ft)
+    width = rng.randint(200, 400)  # feet
+    gs.pending_river = River(lm.name, depth, width, lm.depth_ft)
+    events.append(Event("river", f"\nA river blocks your path.\nEstimated river depth: {depth} ft; width: ~{width} ft.",
+                        detail=lm.name, amount=depth))
+
+def river_crossing(gs: GameState, method: str, rng: random.Random, events: List[Event]) -> None:
+    """Resolve gs.pending_river with one of RIVER_OPTIONS ('wait' re-rolls the river)."""
+    river = gs.pending_river
+    deep = max(0, river.depth - 3)
+    if method == "wait":
+        events.append(Event("river", "You camp and wait for better conditions."))
+        gs.date += timedelta(days=1)
+        _river_ahead(gs, river, rng, events)  # conditions change overnight
+        return
+
+    gs.pending_river = None
+    if method == "caulk":
+        risk = 0.10 + 0.03 * deep
+        gs.date += timedelta(days=1)
+    elif method == "ferry" and gs.party.money_cents >= FERRY_FEE:
+        gs.party.money_cents -= FERRY_FEE
+        events.append(Event("river", f"You paid {money_to_str(FERRY_FEE)} for the ferry.", amount=FERRY_FEE))
+        risk = 0.04 + 0.02 * deep
+    else:
+        if method == "ferry":
+            events.append(Event("river", "You don't have enough money; you must ford."))
+        risk = 0.25 + 0.05 * deep
+
+    if rng.random() >= risk:
+        events.append(Event("river", "You crossed safely."))
+        return
+
+    # Lose some supplies; potential injury
+    lost_food = min(gs.supplies.food_lbs, rng.randint(20, 100))
+    gs.supplies.food_lbs -= lost_food
+    text = "🌊 Disaster! The wagon swamped while crossing.\n"
+    if gs.supplies.ammo > 0 and rng.random() < 0.5:
+        lost_ammo = min(gs.supplies.ammo, rng.randint(10, 50))
+        gs.supplies.ammo -= lost_ammo
+        text += f"You lost {lost_food} lbs of food and {lost_ammo} bullets."
+    else:
+        text += f"You lost {lost_food} lbs of food."
+    events.append(Event("swamped", text, detail=river.name, amount=lost_food))
+    for p in gs.party.living_members():
+        if rng.random() < 0.3:
+            injury = rng.randint(5, 20)
+            p.health = clamp(p.health - injury, 0, 100)
+            events.append(Event("injury", f"{p.name} was injured (-{injury} health).", who=p.name, amount=injury))
+            if p.health == 0:
+                _kill(p, "drowning", f"☠ {p.name} drowned.", events)
+
+def hunt(gs: GameState, rng: random.Random, events: List[Event]) -> bool:
+    """A day of hunting; False (and no day spent) without enough ammunition."""
+    if gs.supplies.ammo < 10:
+        events.append(Event("hunt", "You don't have enough ammunition to hunt (need at least 10 bullets)."))
+        return False
+    gs.date += timedelta(days=1)
+    gs.supplies.ammo = max(0, gs.supplies.ammo - rng.randint(8, 20))
+    gain = rng.randint(40, 160)
+    # Spoilage if too much
+    if gs.party.size() <= 2 and gain > 100:
+        spoil = rng.randint(10, 40)
+    else:
+        spoil = rng.randint(0, 20)
+    kept = max(0, gain - spoil)
+    gs.supplies.food_lbs += kept
+    events.append(Event("hunt", f"You spend the day hunting.\nYou brought back {gain} lbs of game, "
+                                f"but {spoil} lbs spoiled. (+{kept} lbs food)", amount=kept))
+    return True
+
+def rest(gs: GameState, rng: random.Random, events: List[Event]) -> None:
+    events.append(Event("rest", "You decide to rest for the day."))
+    gs.date += timedelta(days=1)
+    for p in gs.party.living_members():
+        p.health = clamp(p.health + rng.randint(3, 7), 0, 100)
+    # Consume food even while resting
+    consume_food(gs)
+
+TRADE_LABELS = {
+    "ammo": "bullets",
+    "food_lbs": "lbs of food",
+    "money_cents": "cash",
+    "clothing": "set of clothing",
+    "wheel": "wagon wheel",
+}
+
+def trade_offer(rng: random.Random) -> Offer:
+    """What the trader gives and what they want for it."""
+    offers = [
+        Offer(("ammo", rng.randint(20, 60)), ("food_lbs", rng.randint(20, 60))),
+        Offer(("food_lbs", rng.randint(30, 80)), ("money_cents", 500)),
+        Offer(("clothing", 1), ("food_lbs", 40)),
+        Offer(("wheel", 1), ("ammo", 50)),
+    ]
+    return rng.choice(offers)
+
+def _holder(gs: GameState, key: str) -> Tuple[object, str]:
+    if key == "money_cents":
+        return gs.party, key
+    return gs.supplies, {"wheel": "wheels"}.get(key, key)
+
+def trade(gs: GameState, offer: Offer, events: List[Event]) -> bool:
+    """Carry out an accepted offer; False if we can't pay."""
+    (give_key, give_qty), (for_key, for_qty) = offer
+    obj, attr = _holder(gs, for_key)
+    if getattr(obj, attr) < for_qty:
+        events.append(Event("trade", "You don't have enough to make that trade."))
+        return False
+    setattr(obj, attr, getattr(obj, attr) - for_qty)
+    obj, attr = _holder(gs, give_key)
+    setattr(obj, attr, getattr(obj, attr) + give_qty)
+    events.append(Event("trade", "The trade is complete."))
+    return True
+
+def _offer_text(offer: Offer) -> str:
+    (give_key, give_qty), (for_key, for_qty) = offer
+    return (f"A trader approaches your camp...\nOffer: they'll give you {give_qty} {TRADE_LABELS[give_key]} "
+            f"for {for_qty} {TRADE_LABELS[for_key]}.")
+
+# ----------------------------- Turn handling -----------------------------
+
+_ON_TRAIL = (TRAVEL, REST, HUNT, PACE, RATIONS, TRADE, CAMP, QUIT)
+_AT_RIVER = (CROSS, QUIT)
+_TRADING = (ACCEPT, DECLINE, QUIT)
+
+def legal_actions(gs: GameState) -> Tuple[str, ...]:
+    """Action kinds step() accepts in this state."""
+    if gs.game_over or gs.victory:
+        return ()
+    if gs.pending_river is not None:
+        return _AT_RIVER
+    if gs.pending_trade is not None:
+        return _TRADING
+    return _ON_TRAIL
+
+def _end_of_day(gs: GameState, rng: random.Random, events: List[Event]) -> None:
+    consume_food(gs)
+    apply_daily_health(gs, gs.weather, rng, events)
+    random_events(gs, gs.weather, rng, events)
+
+def _check_end(gs: GameState, events: List[Event]) -> None:
+    if gs.trail_miles >= gs.total_miles:
+        gs.victory = True
+        events.append(Event("victory", "\n🏁 You made it to Oregon City! Congratulations!", amount=score(gs)))
+    elif gs.party.size() == 0:
+        gs.game_over = True
+        events.append(Event("defeat", "Your entire party has perished. Game over.", detail="perished"))
+    elif gs.date >= WINTER_DATE:
+        gs.game_over = True
+        events.append(Event("defeat", "Winter has arrived and you are still on the trail. "
+                                      "The journey becomes impossible.", detail="winter"))
+
+def step(gs: GameState, action: Action, rng: random.Random, copy: bool = True) -> Tuple[GameState, List[Event]]:
+    """
+    Apply one player action. Returns (new_state, events); the input state is left
+    untouched unless copy=False, which updates it in place (for fast simulation).
+    Raises ValueError for an action that isn't legal right now.
+    """
+    if action.kind not in legal_actions(gs):
+        raise ValueError(f"{action.kind!r} is not allowed now (allowed: {', '.join(legal_actions(gs))})")
+    if copy:
+        gs = gs.clone()
+    events: List[Event] = []
+    kind = action.kind
+    new_day = True
+
+    if kind == TRAVEL:
+        miles = travel_miles_for_day(gs, gs.weather, rng)
+        gs.trail_miles += miles
+        gs.date += timedelta(days=1)
+        events.append(Event("travel", f"You traveled {miles} miles today.", amount=miles))
+        _end_of_day(gs, rng, events)
+        lm = check_landmark(gs, events)
+        if lm and lm.river:
+            _river_ahead(gs, lm, rng, events)
+    elif kind == REST:
+        rest(gs, rng, events)
+    elif kind == HUNT:
+        new_day = hunt(gs, rng, events)
+        if new_day:
+            _end_of_day(gs, rng, events)  # still eat, tire and risk events that day
+    elif kind == CAMP:
+        gs.date += timedelta(days=1)
+        _end_of_day(gs, rng, events)
+    elif kind == CROSS:
+        if action.choice not in RIVER_OPTIONS:
+            raise ValueError(f"unknown river option {action.choice!r}")
+        river_crossing(gs, action.choice, rng, events)
+        new_day = action.choice in ("wait", "caulk")
+    elif kind == PACE or kind == RATIONS:
+        table = PACE_MPD if kind == PACE else RATION_MULTIPLIERS
+        if action.choice not in table:
+            raise ValueError(f"unknown {kind} {action.choice!r}")
+        setattr(gs.party, kind, action.choice)
+        events.append(Event(kind, f"{kind.title()} set to {action.choice}.", detail=action.choice))
+        new_day = False
+    elif kind == TRADE:
+        gs.pending_trade = trade_offer(rng)
+        events.append(Event("trade_offer", _offer_text(gs.pending_trade)))
+        new_day = False
+    elif kind in (ACCEPT, DECLINE):
+        offer, gs.pending_trade = gs.pending_trade, None
+        if kind == ACCEPT:
+            trade(gs, offer, events)
+        else:
+            events.append(Event("trade", "You decline the trade."))
+        new_day = False
+    elif kind == QUIT:
+        gs.game_over = True
+        events.append(Event("defeat", "You abandon the journey. Game over.", detail="quit"))
+        return gs, events
+
+    if new_day:
+        gs.weather = daily_weather(gs.date, rng)
+    _check_end(gs, events)
+    return gs, events
+
+Policy = Callable[[GameState], Action]
+
+def play(gs: GameState, policy: Policy, rng: random.Random, max_steps: int = 10000) -> Tuple[GameState, int]:
+    """Run policy to the end of the game, in place. Returns (state, steps taken)."""
+    steps = 0
+    while not gs.finished and steps < max_steps:
+        step(gs, policy(gs), rng, copy=False)
+        steps += 1
+    return gs, steps
+
+def steady_policy(gs: GameState) -> Action:
+    """A simple bot: travel, rest when someone is weak, hunt when food runs low, ford rivers."""
+    if gs.pending_river is not None:
+        return Action(CROSS, "ferry" if gs.party.money_cents >= FERRY_FEE else "caulk")
+    if gs.pending_trade is not None:
+        return Action(DECLINE)
+    living = gs.party.living_members()
+    if living and min(p.health for p in living) < 30:
+        return Action(REST)
+    if gs.supplies.food_lbs < 40 * len(living) and gs.supplies.ammo >= 10:
+        return Action(HUNT)
+    return Action(TRAVEL)
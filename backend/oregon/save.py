@@ -0,0 +1,160 @@
+"""
+Binary save files for a trail in progress.
+
+A save is a small versioned blob: a header (magic + format version), the state
+packed with struct (little-endian, length-prefixed UTF-8 strings), optionally
+the random.Random state so a resumed game rolls exactly the dice it would have,
+and a CRC32 of everything before it. loads(dumps(gs)) gives back a state with
+the same snapshot(), so a resumed game plays on exactly as if it never stopped.
+
+Bump VERSION whenever the layout changes, and keep a reader for the old one.
+"""
+
+import os
+import random
+import struct
+import zlib
+from datetime import date
+from typing import Optional, Tuple
+
+from backend.oregon.engine import GameState, Offer, Party, Person, River, Supplies, Weather
+
+MAGIC = b"OTSV"
+VERSION = 1
+SAVE_PATH = os.getenv("OREGON_SAVE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "pipboy", "oregon_trail.sav"))
+
+# Stored as an index, so only ever append to these
+PACES = ("steady", "strenuous", "grueling")
+RATIONS = ("bare-bones", "meager", "normal", "filling")
+
+_HEADER = struct.Struct("<4sH")
+_CORE = struct.Struct("<iiIHBiBB")      # miles, total, date ordinal, next landmark, flags, money, pace, rations
+_SUPPLIES = struct.Struct("<7i")
+_PERSON = struct.Struct("<?h")          # alive, health
+_RIVER = struct.Struct("<hhhh")         # depth, width, depth range
+_RNG = struct.Struct("<625I?d")         # Mersenne Twister state, gauss_next
+_CRC = struct.Struct("<I")
+
+GAME_OVER, VICTORY, HAS_RIVER, HAS_TRADE, HAS_RNG = 1, 2, 4, 8, 16
+
+
+class SaveError(ValueError):
+    pass
+
+
+def _pack_str(out: list, text: str) -> None:
+    data = text.encode("utf-8")
+    out.append(struct.pack("<H", len(data)))
+    out.append(data)
+
+
+def dumps(gs: GameState, rng: Optional[random.Random] = None) -> bytes:
+    """gs (and rng's state, if given) as save-file bytes."""
+    p, s = gs.party, gs.supplies
+    flags = ((GAME_OVER if gs.game_over else 0) | (VICTORY if gs.victory else 0)
+             | (HAS_RIVER if gs.pending_river else 0) | (HAS_TRADE if gs.pending_trade else 0)
+             | (HAS_RNG if rng is not None else 0))
+    try:
+        out = [_HEADER.pack(MAGIC, VERSION),
+               _CORE.pack(gs.trail_miles, gs.total_miles, gs.date.toordinal(), gs.next_landmark_idx, flags,
+                          p.money_cents, PACES.index(p.pace), RATIONS.index(p.rations)),
+               _SUPPLIES.pack(s.oxen, s.food_lbs, s.ammo, s.clothing, s.wheels, s.axles, s.tongues)]
+        _pack_str(out, gs.weather.label)
+        out.append(struct.pack("<b", gs.weather.health_mod))
+        _pack_str(out, p.leader)
+        out.append(struct.pack("<B", len(p.members)))
+        for m in p.members:
+            _pack_str(out, m.name)
+            out.append(_PERSON.pack(m.alive, m.health))
+        if gs.pending_river:
+            r = gs.pending_river
+            _pack_str(out, r.name)
+            out.append(_RIVER.pack(r.depth, r.width, *r.depth_ft))
+        if gs.pending_trade:
+            for key, qty in gs.pending_trade:
+                _pack_str(out, key)
+                out.append(struct.pack("<i", qty))
+        if rng is not None:
+            _, mt, gauss = rng.getstate()
+            out.append(_RNG.pack(*mt, gauss is not None, gauss or 0.0))
+    except (struct.error, ValueError) as e:
+        raise SaveError(f"can't save this state: {e}") from e
+    body = b"".join(out)
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def string(self) -> str:
+        (n,) = struct.unpack_from("<H", self.data, self.pos)
+        self.pos += 2 + n
+        if self.pos > len(self.data):
+            raise SaveError("save file is truncated")
+        return self.data[self.pos - n:self.pos].decode("utf-8")
+
+    def integer(self, fmt: str = "<i") -> int:
+        return self.unpack(struct.Struct(fmt))[0]
+
+
+def loads(data: bytes) -> Tuple[GameState, Optional[random.Random]]:
+    """(state, rng) from save-file bytes; rng is None if the save didn't include one."""
+    if len(data) < _HEADER.size + _CRC.size:
+        raise SaveError("save file is truncated")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError("not an Oregon Trail save file")
+    if version != VERSION:
+        raise SaveError(f"unsupported save version {version} (this game reads {VERSION})")
+    body, (crc,) = data[:-_CRC.size], _CRC.unpack(data[-_CRC.size:])
+    if zlib.crc32(body) != crc:
+        raise SaveError("save file is corrupt (checksum mismatch)")
+
+    r = _Reader(body)
+    r.pos = _HEADER.size
+    try:
+        trail_miles, total_miles, day, next_lm, flags, money, pace, rations = r.unpack(_CORE)
+        supplies = Supplies(*r.unpack(_SUPPLIES))
+        weather = Weather(r.string(), r.integer("<b"))
+        leader = r.string()
+        members = [Person(r.string(), *r.unpack(_PERSON)) for _ in range(r.integer("<B"))]
+        river = offer = rng = None
+        if flags & HAS_RIVER:
+            name = r.string()
+            depth, width, lo, hi = r.unpack(_RIVER)
+            river = River(name, depth, width, (lo, hi))
+        if flags & HAS_TRADE:
+            offer = Offer((r.string(), r.integer()), (r.string(), r.integer()))
+        if flags & HAS_RNG:
+            *mt, has_gauss, gauss = r.unpack(_RNG)
+            rng = random.Random()
+            rng.setstate((3, tuple(mt), gauss if has_gauss else None))
+        party = Party(leader, members, money, PACES[pace], RATIONS[rations])
+        gs = GameState(trail_miles, total_miles, date.fromordinal(day), party, supplies, next_lm,
+                       bool(flags & GAME_OVER), bool(flags & VICTORY), weather, river, offer)
+    except (struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        raise SaveError(f"save file is damaged: {e}") from e
+    if r.pos != len(body):
+        raise SaveError("save file has trailing data")
+    return gs, rng
+
+
+def save_game(gs: GameState, rng: Optional[random.Random] = None, path: str = SAVE_PATH) -> None:
+    """Write the save atomically, so a crash mid-save never eats the old one."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(gs, rng))
+    os.replace(tmp, path)
+
+
+def load_game(path: str = SAVE_PATH) -> Tuple[GameState, Optional[random.Random]]:
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,73 @@
+"""
+A fixed play strategy: what to buy at Independence and simple thresholds for
+the daily decision. The scalar engine runs it through policy(); the batch
+simulator applies the same rules to whole arrays of parties.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+from backend.oregon.engine import (
+    Action, GameState, CROSS, DECLINE, HUNT, PACE_MPD, PROFESSIONS, RATION_MULTIPLIERS,
+    REST, TRAVEL, buy, new_game,
+)
+
+RIVER_METHODS = ("ford", "caulk", "ferry")
+
+
+@dataclass(frozen=True)
+class Strategy:
+    profession: str = "c"       # PROFESSIONS key
+    start_month: int = 3        # 3 (March) .. 7 (July)
+    party_size: int = 5
+    pace: str = "steady"
+    rations: str = "normal"
+    oxen: int = 8
+    food_lbs: int = 1000
+    ammo: int = 200
+    clothing: int = 2
+    spares: int = 1             # of each wagon part
+    hunt_below: int = 40        # hunt when food per living member drops below this (lbs)
+    rest_below: int = 30        # rest when anyone's health drops below this
+    river: str = "ferry"        # RIVER_METHODS; a ferry we can't pay for means fording
+
+    def __post_init__(self):
+        if self.profession not in PROFESSIONS:
+            raise ValueError(f"unknown profession {self.profession!r}")
+        if self.pace not in PACE_MPD or self.rations not in RATION_MULTIPLIERS:
+            raise ValueError(f"unknown pace/rations {self.pace!r}/{self.rations!r}")
+        if self.river not in RIVER_METHODS:
+            raise ValueError(f"unknown river method {self.river!r}")
+        if not 1 <= self.party_size <= 5 or not 3 <= self.start_month <= 7:
+            raise ValueError("party_size must be 1-5 and start_month 3-7")
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+    def new_game(self, rng: random.Random) -> GameState:
+        """A game with this strategy's party, supplies, pace and rations, ready to travel."""
+        members = tuple(f"Member {i}" for i in range(1, self.party_size))
+        gs = new_game(rng, self.profession, "Leader", members, self.start_month)
+        buy(gs, "oxen", self.oxen)
+        buy(gs, "food_lbs", self.food_lbs)
+        buy(gs, "ammo", self.ammo)
+        buy(gs, "clothing", self.clothing)
+        for part in ("wheel", "axle", "tongue"):
+            buy(gs, part, self.spares)
+        gs.party.pace = self.pace
+        gs.party.rations = self.rations
+        return gs
+
+    def policy(self, gs: GameState) -> Action:
+        """The daily decision, for engine.play(gs, strategy.policy, rng)."""
+        if gs.pending_river is not None:
+            return Action(CROSS, self.river)
+        if gs.pending_trade is not None:
+            return Action(DECLINE)
+        living = gs.party.living_members()
+        if living and min(p.health for p in living) < self.rest_below:
+            return Action(REST)
+        if gs.supplies.food_lbs < self.hunt_below * len(living) and gs.supplies.ammo >= 10:
+            return Action(HUNT)
+        return Action(TRAVEL)
@@ -0,0 +1,133 @@
+"""
+Strategy sweep: play every Strategy in a grid with the batch simulator, spread
+over a process pool, and merge the results into one table.
+
+Every grid point gets its own child of numpy.random.SeedSequence(master_seed),
+picked by its position in the grid, so the table is bit-for-bit the same for a
+given seed no matter how many workers run it or in which order they finish.
+Grid points are independent, so the run scales with the number of cores.
+
+    python -m backend.oregon.sweep --seed 42 --parties 1000 --workers 8 --out sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from backend.oregon.batch import simulate
+from backend.oregon.engine import PROFESSIONS
+from backend.oregon.strategy import Strategy
+
+DEFAULT_GRID = {
+    "profession": list(PROFESSIONS),
+    "start_month": [3, 4, 5],
+    "pace": ["steady", "strenuous", "grueling"],
+    "rations": ["meager", "normal", "filling"],
+    "oxen": [6, 9],
+    "food_lbs": [500, 1000],
+    "hunt_below": [20, 60],
+    "rest_below": [20, 40],
+}
+
+METRICS = ("win_rate", "expected_score", "mean_score", "mean_survivors", "deaths_per_party",
+           "perished", "winter", "arrival_p50", "supplies_cost")
+
+
+def grid_strategies(grid: Dict[str, Sequence]) -> List[Strategy]:
+    """Every combination of the grid values, in a fixed order (last key varies fastest)."""
+    keys = list(grid)
+    return [Strategy(**dict(zip(keys, values))) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def supplies_cost(strategy: Strategy) -> int:
+    """
+    What the strategy actually spent at the store, in cents. buy() stops at what
+    the money covers, so a poor profession can pay less than the list price.
+    """
+    gs = strategy.new_game(random.Random(0))  # purchases don't depend on the rng
+    return PROFESSIONS[strategy.profession][1] - gs.party.money_cents
+
+
+def _run_one(task) -> Dict:
+    index, strategy, parties, seed_seq = task
+    result = simulate(strategy, parties, rng=np.random.default_rng(seed_seq))
+    summary = result.summary()
+    wins = result.outcome == 0
+    row = {"index": index, **strategy.as_dict()}
+    row.update({
+        "win_rate": summary["win_rate"],
+        "expected_score": float(np.where(wins, result.score, 0).mean()),
+        "mean_score": summary["mean_score"],
+        "mean_survivors": summary["mean_survivors"],
+        "deaths_per_party": summary["deaths_per_party"],
+        "perished": summary["outcomes"]["perished"],
+        "winter": summary["outcomes"]["winter"],
+        "arrival_p50": summary["arrival"].get("p50", ""),
+        "supplies_cost": supplies_cost(strategy),
+    })
+    return row
+
+
+def sweep(strategies: Iterable[Strategy], parties: int = 500, seed: int = 0,
+          workers: Optional[int] = None) -> List[Dict]:
+    """One result row per strategy, in grid order. workers=1 runs in this process."""
+    strategies = list(strategies)
+    seeds = np.random.SeedSequence(seed).spawn(len(strategies))
+    tasks = [(i, s, parties, seeds[i]) for i, s in enumerate(strategies)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_run_one(t) for t in tasks]
+    # A few tasks per worker keeps them all busy without drowning in pickling
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_one, tasks, chunksize=chunksize))
+
+
+def best(rows: List[Dict], n: int = 10, key: str = "expected_score") -> List[Dict]:
+    return sorted(rows, key=lambda r: (r[key], r["win_rate"]), reverse=True)[:n]
+
+
+def write_csv(rows: List[Dict], path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Oregon Trail strategies across a process pool.")
+    parser.add_argument("--seed", type=int, default=0, help="master seed; same seed, same table")
+    parser.add_argument("--parties", type=int, default=500, help="games per strategy")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--grid", help='JSON overrides for the grid, e.g. \'{"pace": ["steady"]}\'')
+    parser.add_argument("--out", help="write the full table as CSV")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    grid = dict(DEFAULT_GRID, **(json.loads(args.grid) if args.grid else {}))
+    strategies = grid_strategies(grid)
+    t = time.perf_counter()
+    rows = sweep(strategies, args.parties, args.seed, args.workers)
+    seconds = time.perf_counter() - t
+    print(f"{len(rows)} strategies x {args.parties} parties in {seconds:.1f} s "
+          f"({len(rows) * args.parties / seconds:,.0f} games/s)", file=sys.stderr)
+
+    if args.out:
+        write_csv(rows, args.out)
+    varying = [k for k, v in grid.items() if len(v) > 1]
+    for row in best(rows, args.top):
+        setup = ", ".join(f"{k}={row[k]}" for k in varying)
+        print(f"{row['expected_score']:8.1f}  win {row['win_rate']:6.1%}  survivors {row['mean_survivors']:.2f}  {setup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,52 @@
+import time
+_T0 = time.perf_counter()  # boot clock for the startup report
 import sys
+import os
+import json
+import importlib
+import threading
+from functools import partial
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QLabel, QFrame, QPushButton, QMenuBar, QStatusBar, QMainWindow
 from PyQt6.QtCore import QRect, QSize, Qt, QCoreApplication,QThread, pyqtSignal, QTime
-from PyQt6.QtCore import QTimer, QPropertyAnimation, QRect, QEasingCurve
-import time
-import threading
+from PyQt6.QtCore import QTimer, QRect, QEasingCurve
 from PyQt6.QtGui import QPixmap, QColor
-import backend.input as inputting
-import backend.applications.weather as weather
+STARTUP = {"imports_ms": {"PyQt6": (time.perf_counter() - _T0) * 1000}, "lazy_imports_ms": {}, "first_paint_ms": None}
+
+class LazyModule:
+    """Imports the real module on first attribute access, keeping it off the boot path."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    t = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    STARTUP["lazy_imports_ms"][self._name] = (time.perf_counter() - t) * 1000
+                    self._module = module
+        return self._module
+
+    def load(self):
+        """Import now, e.g. from a background thread, so first use doesn't pay for it."""
+        return self._load()
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+_t = time.perf_counter()
+import backend.launcher as launcher
+import backend.app_registry as app_registry
+import backend.hal as hal
+STARTUP["imports_ms"]["backend (eager)"] = (time.perf_counter() - _t) * 1000
+# openai / httpx / pydantic / requests / dotenv load on first use
+inputting = LazyModule("backend.input")
+chatbot = LazyModule("backend.chatbot")
+weather = LazyModule("backend.applications.weather")
 
 imgFileBase = "static//images//"
 
@@ -19,66 +58,301 @@ supersad = imgFileBase + "superSad.png"
 surprised = imgFileBase + "surprise.png"
 angry = imgFileBase + "faceAngry.png"
 
-class MockHardwareAPI:
-    def toggle_lights(self):
-        return True  # Always "turn on" lights (mocking the API)
+LIGHT_PINS = (17,)  # BCM pins for the "Strategic Illumination" lights
+RANGER_PINS = (23, 24)  # BCM trig/echo of the ultrasonic sensor
+DISTANCE_DISPLAY_MS = 100  # how often the distance readout repaints, whatever the sample rate
+TRANSCRIPT_MAX_BLOCKS = 2000  # lines of chat scrollback kept in the window
+
+class SpriteCache:
+    """
+    Decoded + scaled QPixmaps keyed by (path, width, height); disk and scaling happen once.
 
-class FlashingLightsWorker(QThread):
-    # Signal to communicate with the main thread (UI)
+    QPixmaps belong to the GUI thread, so preload() (safe from any thread) only
+    decodes and scales QImages; get() turns those into pixmaps, which is cheap.
+    """
+
+    def __init__(self):
+        self._pixmaps = {}
+        self._images = {}  # preloaded on a worker thread, waiting to become pixmaps
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scaled(image, width, height):
+        return image.scaled(width, height, QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                            QtCore.Qt.TransformationMode.SmoothTransformation)
+
+    def get(self, path, width, height):
+        key = (path, width, height)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            with self._lock:
+                image = self._images.pop(key, None)
+            if image is not None:
+                pixmap = QPixmap.fromImage(image)
+            else:
+                pixmap = QPixmap(path)
+                if pixmap.isNull():
+                    print(f"Failed to load image: {path}")
+                    return pixmap  # don't cache, the file may show up later
+                pixmap = self._scaled(pixmap, width, height)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def preload(self, folder, width, height):
+        """Decode and scale every image in `folder` up front, off the GUI thread if you like."""
+        if not os.path.isdir(folder):
+            return
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith((".png", ".jpg", ".jpeg")):
+                key = (folder + name, width, height)
+                if key in self._pixmaps:
+                    continue
+                image = QtGui.QImage(folder + name)
+                if not image.isNull():
+                    image = self._scaled(image, width, height)
+                    with self._lock:
+                        self._images[key] = image
+
+class LightsBridge(QtCore.QObject):
+    """Carries light state changes from the hardware loop thread to the GUI."""
     update_signal = pyqtSignal(str)
 
-    def __init__(self, hardware_api):
+
+class AnimationScheduler(QtCore.QObject):
+    """
+    One clock for every animation in the window.
+
+    Each animation is a step(now_ms) callback with its own period; the single-shot
+    timer is armed only for the next due step and stays off when nothing is
+    animating. set_pixmap() skips repaints when the frame didn't change.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        self._clock = QtCore.QElapsedTimer()
+        self._clock.start()
+        self._anims = {}   # name -> [step, period_ms, next_due_ms]
+        self._shown = {}   # label -> key of the pixmap it currently shows
+        self.wakeups = 0
+        self.steps = 0
+        self.step_ms_total = 0.0
+        self.step_ms_max = 0.0
+        self.repaints = 0
+        self.skipped = 0
+
+    def start(self, name, step, period_ms):
+        """(Re)start an animation; step(now_ms) returns False when it is done."""
+        self._anims[name] = [step, period_ms, self._clock.elapsed()]
+        self._arm()
+
+    def stop(self, name):
+        self._anims.pop(name, None)
+        self._arm()
+
+    def is_active(self, name):
+        return name in self._anims
+
+    def _arm(self):
+        if not self._anims:
+            self._timer.stop()  # idle: no wakeups at all
+            return
+        due = min(a[2] for a in self._anims.values())
+        self._timer.start(max(0, int(due - self._clock.elapsed())))
+
+    def _tick(self):
+        self.wakeups += 1
+        now = self._clock.elapsed()
+        for name, anim in list(self._anims.items()):
+            step, period, due = anim
+            if due > now:
+                continue
+            t0 = time.perf_counter()
+            keep = step(now)
+            ms = (time.perf_counter() - t0) * 1000
+            self.steps += 1
+            self.step_ms_total += ms
+            self.step_ms_max = max(self.step_ms_max, ms)
+            if self._anims.get(name) is not anim:
+                continue  # step restarted or stopped itself
+            if keep:
+                # Stay on the grid, but don't try to catch up missed frames
+                anim[2] = max(due + period, now + 1)
+            else:
+                del self._anims[name]
+        self._arm()
+
+    def set_pixmap(self, label, key, pixmap):
+        """setPixmap only if `key` differs from what the label already shows."""
+        if self._shown.get(label) == key:
+            self.skipped += 1
+            return
+        self._shown[label] = key
+        label.setPixmap(pixmap)
+        self.repaints += 1
+
+    def stats(self):
+        return {
+            "active": sorted(self._anims),
+            "wakeups": self.wakeups,
+            "steps": self.steps,
+            "avg_step_ms": self.step_ms_total / self.steps if self.steps else 0.0,
+            "max_step_ms": self.step_ms_max,
+            "repaints": self.repaints,
+            "skipped_repaints": self.skipped,
+        }
+
+class HoverGrow(QtCore.QObject):
+    """Grows a widget a few pixels on hover, tweened by the AnimationScheduler."""
+
+    def __init__(self, widget, scheduler, grow=5, duration_ms=200):
+        super().__init__(widget)
+        self.widget = widget
+        self.scheduler = scheduler
+        self.grow = grow
+        self.duration_ms = duration_ms
+        self.easing = QEasingCurve(QEasingCurve.Type.OutQuad)
+        self.name = f"hover-{id(widget)}"
+        self.base = None  # geometry before the first hover
+        widget.installEventFilter(self)
+
+    def _tween(self, end):
+        start = self.widget.geometry()
+        t0 = None
+
+        def step(now):
+            nonlocal t0
+            if t0 is None:
+                t0 = now
+            p = min(1.0, (now - t0) / self.duration_ms)
+            e = self.easing.valueForProgress(p)
+            self.widget.setGeometry(QRect(
+                round(start.x() + (end.x() - start.x()) * e),
+                round(start.y() + (end.y() - start.y()) * e),
+                round(start.width() + (end.width() - start.width()) * e),
+                round(start.height() + (end.height() - start.height()) * e),
+            ))
+            return p < 1.0
+
+        self.scheduler.start(self.name, step, 16)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget:
+            if event.type() == QtCore.QEvent.Type.Enter:
+                # Base geometry is taken when not hovered, so repeated hovers can't drift
+                if self.base is None:
+                    self.base = self.widget.geometry()
+                g = self.grow
+                self._tween(self.base.adjusted(-g, -g, g, g))
+            elif event.type() == QtCore.QEvent.Type.Leave and self.base is not None:
+                self._tween(self.base)
+        return super().eventFilter(obj, event)
+
+class WeatherBridge(QtCore.QObject):
+    """Carries WeatherService results from its thread to the GUI thread."""
+    update_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(str)
+    ready_signal = pyqtSignal()  # the weather module finished importing
+
+class FirstPaintProbe(QtCore.QObject):
+    """Calls callback() once, right after the watched widget paints for the first time."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QtCore.QEvent.Type.Paint:
+            self.widget.removeEventFilter(self)
+            # Let this paint finish before starting deferred work
+            QTimer.singleShot(0, self.callback)
+        return super().eventFilter(obj, event)
+
+class ChatStreamWorker(QThread):
+    """Runs one chat turn off the GUI thread and streams the reply back as signals."""
+    token_signal = pyqtSignal(str)
+    done_signal = pyqtSignal(str, str, list)  # reply, emotion, apps to offer
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, prompt):
         super().__init__()
-        
-        #self.hardware_api = hardware_api
-        self.hardware_api = MockHardwareAPI()
-        #self.setup_external_control() #commented to avoid crash
-        self.running = True  # Control flag for the loop
-        
-    
+        self.prompt = prompt
+
     def run(self):
-        """The loop that controls the lights on an external system (hardware or API)."""
-        while self.running:
-            self.toggle_lights()
-            time.sleep(1)  # Flash every second (adjust as needed)
-
-    def stop(self):
-        """Stop the background task."""
-        self.running = False
-
-    def toggle_lights(self):
-        """Toggle the lights and update the UI with the new state."""
-        state = self.hardware_api.toggle_lights()
-        state_text = "Lights ON" if state else "Lights OFF"
-        self.update_signal.emit(state_text)
-
-
-# Function to apply animation when the button is hovered over
-        def animate_button_hover():
-            # On hover, scale the button up a little bit
-            self.animation.setStartValue(self.pushButton.geometry())
-            self.animation.setEndValue(QRect(self.pushButton.x() - 5, self.pushButton.y() - 5, self.pushButton.width() + 10, self.pushButton.height() + 10))
-            self.animation.start()
-
-        # Function to revert the animation when the mouse leaves
-        def animate_button_leave():
-            # On mouse leave, scale the button back to normal size
-            self.animation.setStartValue(self.pushButton.geometry())
-            self.animation.setEndValue(QRect(self.pushButton.x() + 5, self.pushButton.y() + 5, self.pushButton.width() - 10, self.pushButton.height() - 10))
-            self.animation.start()
-
-        # Connect hover events to trigger animations
-        self.pushButton.setGraphicsEffect(None)
-        self.pushButton.installEventFilter(self)
-
-        # When the mouse enters the button's area
-        def eventFilter(self, obj, event):
-            if obj == self.pushButton:
-                if event.type() == QtCore.QEvent.Type.Enter:
-                    animate_button_hover()
-                elif event.type() == QtCore.QEvent.Type.Leave:
-                    animate_button_leave()
-            return super().eventFilter(obj, event)
+        try:
+            resp, emo, apps = inputting.user_prompt_stream(self.prompt, self.token_signal.emit)
+        except Exception as e:
+            self.error_signal.emit(f"[error: {e}]")
+            return
+        self.done_signal.emit(resp, emo, apps)
+
+class TranscriptView(QtWidgets.QPlainTextEdit):
+    """
+    Read-only chat transcript that only ever appends.
+
+    QPlainTextEdit lays text out block by block, so an append re-lays out the
+    last paragraph instead of the whole document, and setMaximumBlockCount makes
+    it a scrollback ring that drops the oldest lines. Streamed tokens are
+    buffered and written with one insert per FLUSH_MS.
+    """
+
+    FLUSH_MS = 30
+
+    def __init__(self, parent=None, max_blocks=TRANSCRIPT_MAX_BLOCKS):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)  # the undo stack would keep every evicted line alive
+        self.setMaximumBlockCount(max_blocks)
+        self._cursor = QtGui.QTextCursor(self.document())
+        self._pending = []
+        self._line_open = False  # last written character wasn't a newline
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+        self.appends = 0
+        self.inserts = 0
+
+    def write(self, text):
+        """Continue the current line (streamed tokens, app output)."""
+        if not text:
+            return
+        self._pending.append(text)
+        self._line_open = not text.endswith("\n")
+        self.appends += 1
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_MS)
+
+    def add_line(self, text=""):
+        """Start a new line, e.g. a new message."""
+        self.write(("\n" if self._line_open else "") + text)
+
+    def flush(self):
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        bar = self.verticalScrollBar()
+        follow = bar.value() >= bar.maximum() - 2  # don't yank the view if the user scrolled up
+        self._cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        self._cursor.insertText(text)
+        self.inserts += 1
+        if follow:
+            bar.setValue(bar.maximum())
+
+    def clear(self):
+        self._pending.clear()
+        self._flush_timer.stop()
+        self._line_open = False
+        super().clear()
+
+class AppOutputBridge(QtCore.QObject):
+    """Carries a launched app's output from the launcher's reader thread to the GUI."""
+    output_signal = pyqtSignal(str)
+    exit_signal = pyqtSignal(int)
 
 class Ui_MainWindow(object):
     emo = "Happy"
@@ -96,18 +370,54 @@ class Ui_MainWindow(object):
     def __init__(self):
         self.animation_runs = 0  # Counter to track the number of runs
         self.max_animation_runs = 3  # Maximum number of times the animation will run
+        self.chat_worker = None
+        self.awaiting_first_token = False
+        self.launcher = launcher.AppLauncher()
+        self.running_app = None
+        self.pending_launch = None  # app to start once the running one has exited
+        self.sprites = SpriteCache()
+        self.lights = None
+        self.lights_flashing = False
+        self.distance = None
+        self.distance_seq = 0
     
     def button_2_pressed(self):
-        # Add whatever logic you want to run when the button is pressed
+        """Start/stop the distance readout in the status bar."""
         print("Button 2 was pressed!")
-        # You can also call other functions here
-        self.some_other_function()
+        if self.distance is not None and self.distance.running():
+            self.stop_distance()
+            return
+        if self.distance is None:
+            from backend.hal.distance import DistancePipeline  # numpy only loads when asked for
+            from backend.hal.ranging import open_rangefinder
+            # The rangefinder is opened on the hardware thread, which owns the pins
+            self.distance = DistancePipeline(lambda backend: open_rangefinder(backend, *RANGER_PINS))
+        self.distance_seq = 0
+        self.distance.start(hal.get_loop())
+        self.statusbar.showMessage("Locating...")
+        self.animator.start("distance", self.show_distance, DISTANCE_DISPLAY_MS)
+
+    def stop_distance(self):
+        self.distance.stop()
+        self.animator.stop("distance")
+        print(f"[distance] {self.distance.stats()}")
+        self.statusbar.showMessage("Distance location off")
+
+    def show_distance(self, now):
+        """Display-rate step: repaint only when the pipeline has a new reading."""
+        reading = self.distance.latest()
+        if reading is not None and reading.seq != self.distance_seq:
+            self.distance_seq = reading.seq
+            self.statusbar.showMessage(f"Distance: {reading.distance:6.1f} cm")
+        return True
 
     def button_1_pressed(self):
-        # Add whatever logic you want to run when the button is pressed
-        print("Button 2 was pressed!")
-        # You can also call other functions here
-        self.some_other_function()
+        """Start/stop flashing the lights."""
+        print("Button 1 was pressed!")
+        if self.lights is None:
+            self.setup_external_control()
+        self.lights_flashing = not self.lights_flashing
+        self.lights.flash(self.lights_flashing)
 
     def some_other_function(self):
         print("Executing another function after button 2 press!")
@@ -155,7 +465,7 @@ class Ui_MainWindow(object):
         self.chatbotEnter.setFont(font)
 
         # Fixed Chat Text Box (Read-only, Multi-line)
-        self.chattext_box = QtWidgets.QTextEdit(parent=self.centralwidget)
+        self.chattext_box = TranscriptView(parent=self.centralwidget)
         #self.chattext_box.setGeometry(QtCore.QRect(40, 500, 811, 531))  # Adjust position and size
         self.chattext_box.setPlaceholderText("This is a fixed text box (user can't edit).")
         self.chattext_box.setReadOnly(True)  # Make it read-only so the user can't modify the text
@@ -198,10 +508,9 @@ class Ui_MainWindow(object):
         font.setPointSize(10)
         self.pushButton.setFont(font)
         self.pushButton.clicked.connect(self.button_1_pressed)
-        # Create a QPropertyAnimation for scaling effect
-        self.animation = QPropertyAnimation(self.pushButton, b"geometry")
-        self.animation.setDuration(200)  # Duration of animation (in milliseconds)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutQuad)  # Smooth animation curve
+        # Hover scaling effect, driven by the shared animation clock
+        self.animator = AnimationScheduler(MainWindow)
+        self.hover_effect = HoverGrow(self.pushButton, self.animator)
 
         
 
@@ -272,17 +581,17 @@ class Ui_MainWindow(object):
 
     #external GPIO control setup
     def setup_external_control(self):
-        """Set up the external worker (background loop)"""
-        self.hardware_api = ExternalHardwareAPI()#will crash it for now
-        self.worker = FlashingLightsWorker(self.hardware_api)
-        self.worker.update_signal.connect(self.update_ui_from_worker)
+        """Put the lights on the shared hardware loop (real GPIO or the simulator)."""
+        self.lights_bridge = LightsBridge()
+        self.lights_bridge.update_signal.connect(self.update_ui_from_worker)
+        self.lights = hal.get_loop().add_device(hal.Lights(
+            LIGHT_PINS, period=1.0,  # Flash every second (adjust as needed)
+            on_change=lambda on: self.lights_bridge.update_signal.emit("Lights ON" if on else "Lights OFF"),
+        ))
     
     def update_ui_from_worker(self, status_text):
         """Update the UI with the flashing light status."""
-        self.status_label.setText(status_text)
-
-    #self.worker.start() #start
-    #self.worker.stop() #stop
+        self.statusbar.showMessage(status_text)
 
 
     def chatresponse(self, entered_text):
@@ -294,38 +603,112 @@ class Ui_MainWindow(object):
         """Simulate an external function that updates the text box."""
         # Here, you can set the text of the text box from an external source
         new_text = "Updated text from an external function."#update before implementation
-        self.chattext_box.setText(new_text)
+        self.chattext_box.add_line(new_text)
 
 
     def enterPress(self):        
         """Handle the event when the user presses Enter in the chatbot input field."""
         # Get the text from the chatbot input field
         entered_text = self.chatbotEnter.text()
+        if not entered_text.strip():
+            return
+        if self.chat_worker is not None and self.chat_worker.isRunning():
+            print("Still answering the last message.")
+            return
         print(f"User entered: {entered_text}")
         
         # Clear the input field after getting the text
         self.chatbotEnter.clear()
 
-        # Generate a response from the entered text (you could call a different function here)
-        response = self.chatresponse(entered_text)
-        textresponse = response[0]
-        emot = response[1]
+        # While an app runs, the input box is its keyboard
+        if self.running_app is not None and self.running_app.is_running():
+            self.chattext_box.write(entered_text + "\n")
+            self.running_app.send_input(entered_text)
+            return
+
+        # Generate the response on a worker thread; text arrives token by token
+        self.chattext_box.add_line(f"> {entered_text}")
+        self.awaiting_first_token = True
+        self.chat_worker = ChatStreamWorker(entered_text)
+        self.chat_worker.token_signal.connect(self.chat_token)
+        self.chat_worker.done_signal.connect(self.chat_done)
+        self.chat_worker.error_signal.connect(self.chat_error)
+        self.chat_worker.start()
+
+    def chat_token(self, token):
+        """Append one streamed piece of the reply; the face starts talking on the first one."""
+        if self.awaiting_first_token:
+            self.awaiting_first_token = False
+            self.chattext_box.add_line()
+            self.restartAnimation()
+        self.chattext_box.write(token)
+
+    def chat_done(self, textresponse, emot, apps):
         print(f"Chatbot emotion: {emot}")
-        print(f"Chatbot response: {response}")
-        
-        # Set the response text into the chattext_box
-        self.chattext_box.setText(textresponse)
-        self.restartAnimation()
+        print(f"Chatbot response: {textresponse}")
+        if self.awaiting_first_token:
+            # Nothing was streamed, show the whole reply at once
+            self.awaiting_first_token = False
+            self.chattext_box.add_line(textresponse)
+            self.restartAnimation()
         self.emo = emot
-   
-    
-
-
+        if not self.animator.is_active("talk"):
+            # Talk animation already ended before the emotion came back
+            self.end_animation()
+        for name in apps:
+            if self.confirm_launch(name):
+                self.launch_app(name)
+                break  # one app at a time
+
+    def confirm_launch(self, name):
+        """Ask with a dialog instead of input(), which would hang the GUI."""
+        answer = QtWidgets.QMessageBox.question(
+            self.centralwidget, "Run program", f"Run {name}?",
+            QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+            QtWidgets.QMessageBox.StandardButton.No,
+        )
+        return answer == QtWidgets.QMessageBox.StandardButton.Yes
+
+    def launch_app(self, name):
+        """Start the app in the warm interpreter; its output streams into chattext_box."""
+        info = app_registry.registry.get(name)
+        if info is None:
+            self.chattext_box.add_line(f"[{name} is not installed]")
+            return
+        if info.needs_hardware and self.distance is not None and self.distance.running():
+            # The app opens the same pins; two readers would trip over each other's echoes
+            self.stop_distance()
+            self.chattext_box.add_line("[distance readout off while the program uses the sensor]")
+        if self.running_app is not None:
+            # Stop the old app off the GUI thread and launch from its exit signal,
+            # so its bridge stays alive until that signal has been delivered
+            self.pending_launch = name
+            if self.running_app.is_running():
+                self.chattext_box.add_line(f"[stopping {self.running_app.name}]")
+                self.running_app.stop_async()
+            return
+        bridge = AppOutputBridge()
+        bridge.output_signal.connect(self.app_output)
+        bridge.exit_signal.connect(partial(self.app_exited, bridge))
+        self.chattext_box.add_line(f"[running {info.title}]\n")
+        self.running_app = self.launcher.start(info.path, bridge.output_signal.emit, bridge.exit_signal.emit)
+        self.running_app.bridge = bridge
+
+    def app_output(self, text):
+        self.chattext_box.write(text)
+
+    def app_exited(self, bridge, code):
+        self.chattext_box.add_line(f"[program exited with code {code}]\n")
+        if self.running_app is not None and self.running_app.bridge is bridge:
+            self.running_app = None
+        if self.running_app is None and self.pending_launch is not None:
+            name, self.pending_launch = self.pending_launch, None
+            self.launch_app(name)
+
+    def chat_error(self, message):
+        self.awaiting_first_token = False
+        self.chattext_box.add_line(message)
 
-    
-        
-        
-        
     def setup_animation(self, parent):
         # QLabel to display images
         self.talkimagePaths = [
@@ -338,25 +721,15 @@ class Ui_MainWindow(object):
         ]
         
         self.current_frame = 0  # To track the current image frame
-        
-        # Create a QTimer and pass the parent (MainWindow) here
-        self.timer = QTimer(parent)
-        self.timer.timeout.connect(self.update_image)
-        self.timer.start(100)  # Update every 100 milliseconds
 
-    def update_image(self):
-        """Update the image on the QLabel."""
-        try:
-            pixmap = QPixmap(self.talkimagePaths[self.current_frame])
-            
-            pixmap = pixmap.scaled(self.xAd(75), self.yAd(75), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
-            
-            if not pixmap.isNull():  # Check if the image was loaded successfully
-                self.image_label.setPixmap(pixmap)
-            else:
-                print(f"Failed to load image: {self.talkimagePaths[self.current_frame]}")
-        except Exception as e:
-            print(f"Error loading image: {e}")
+        self.restartAnimation()
+
+    def update_image(self, now=None):
+        """Show the next talk frame. Returns False once the talk animation is over."""
+        path = self.talkimagePaths[self.current_frame]
+        pixmap = self.sprites.get(path, self.xAd(75), self.yAd(75))
+        if not pixmap.isNull():  # Check if the image was loaded successfully
+            self.animator.set_pixmap(self.image_label, path, pixmap)
         
         # Update to the next image
         self.current_frame += 1
@@ -368,8 +741,9 @@ class Ui_MainWindow(object):
 
         # Check if the animation has run the desired number of times
         if self.animation_runs >= self.max_animation_runs:
-            self.timer.stop()  # Stop the animation
             self.end_animation()  # Call function for the ending state
+            return False
+        return True
 
     def end_animation(self):
         """Function to run after animation finishes."""
@@ -378,58 +752,106 @@ class Ui_MainWindow(object):
         # For example, set a final image as the rest state
         emot = self.emo
         print("Detected int emotion:", emot)
-        try:
-            pixmap = QPixmap(self.emotionsStore[emot])
-            print("mapping success")
-        except:
-            pixmap = QPixmap(smileClosed)  # Default image if emotion not found
-            print("mapping error")
+        if emot not in self.emotionsStore:
+            print("mapping error, unknown emotion:", emot)
+            emot = "Happy"  # Default image if emotion not found
         print("detected final emotion:", emot,"with image:", self.emotionsStore[emot])
-        pixmap = pixmap.scaled(self.xAd(75), self.yAd(75), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
-        
-        final_pixmap = QPixmap(pixmap)  # Replace with actual path
-        self.image_label.setPixmap(final_pixmap)
+        path = self.emotionsStore[emot]
+        self.animator.set_pixmap(self.image_label, path, self.sprites.get(path, self.xAd(75), self.yAd(75)))
         """Reset animation if needed (for example, if you want to restart it)."""
         """Resets the animation so it can be restarted."""
         print("Resetting animation...")
 
-        # Stop the timer (if running)
-        if self.timer is not None and self.timer.isActive():
-            self.timer.stop()
+        # Stop the talk animation (if running)
+        self.animator.stop("talk")
+        print("Animation stats:", self.animator.stats())
 
         # Reset animation variables
         self.animation_runs = 0
         self.current_frame = 0
         
 
+    def shutdown(self):
+        """Stop a running app and the spare interpreter when the window closes."""
+        if self.running_app is not None:
+            self.running_app.stop()
+        self.launcher.close()
+        if getattr(self, "weather_service", None) is not None:
+            self.weather_service.stop()
+        if self.distance is not None:
+            self.distance.stop()
+        hal.shutdown()
+
     def restartAnimation(self):
         """Function to restart the animation."""
         print("Restarting animation...")
         self.animation_runs = 0
         self.current_frame = 0
-        if self.timer is not None:
-            self.timer.start(100)  # Restart the timer to resume animation
+        self.animator.start("talk", self.update_image, 100)  # Update every 100 milliseconds
 
     
 def weather_update_weather(self, city_name):
-    """Update the weather box with weather information for the given city."""
-    # Get weather data (weather description and temperature)
-    weather_description = weather.get_weather(city_name)
-    #temp = weather_description[1]
-    # If we successfully got weather data, update the weather box
-    try:
-        weatherd = weather_description["weather"][0]["description"]
-        temp = weather_description["main"]["temp"]
-    except:
-        weatherd = None
-        temp = None
-    if weather_description and temp is not None:
-        weather_info = f"Weather in {city_name}: {weatherd} and a temperature of {temp}°C"
-        self.weather_box.setText(weather_info)
-    else:
+    """Start refreshing the weather box for the given city in the background."""
+    self.weather_bridge = WeatherBridge()
+    self.weather_bridge.update_signal.connect(lambda data: weather_show(self, data))
+    self.weather_bridge.error_signal.connect(lambda message: weather_failed(self, city_name, message))
+    self.weather_bridge.ready_signal.connect(lambda: weather_start(self, city_name))
+
+    def load():
+        # requests/dotenv import here, not on the GUI thread
+        weather.load()
+        self.weather_bridge.ready_signal.emit()
+    threading.Thread(target=load, name="weather-import", daemon=True).start()
+
+def weather_start(self, city_name):
+    self.weather_service = weather.WeatherService(
+        city_name, self.weather_bridge.update_signal.emit, self.weather_bridge.error_signal.emit)
+    self.weather_service.start()
+
+def weather_show(self, data):
+    """Update the weather box with weather information (runs on the GUI thread)."""
+    unit = "°C" if data["units"] == "metric" else "°F"
+    weather_info = f"Weather in {data['city']}: {data['description']} and a temperature of {data['temp']}{unit}"
+    if data.get("stale"):
+        weather_info += f" (as of {data['age'] / 60:.0f} min ago)"
+    self.weather_box.setText(weather_info)
+
+def weather_failed(self, city_name, message):
+    print(f"Weather refresh failed: {message}")
+    if self.weather_service.last is None:
         # If something went wrong, display an error message
-        self.weather_box.setText(f"Could not retrieve weather for {city_name}. Please try again.") 
-      
+        self.weather_box.setText(f"Could not retrieve weather for {city_name}. Please try again.")
+    # otherwise keep showing the last good reading until the retry succeeds
+
+def startup_report():
+    """Import times and time-to-first-paint (ms since mainfront started importing)."""
+    return dict(STARTUP, total_import_ms=sum(STARTUP["imports_ms"].values()))
+
+def write_startup_report():
+    # PIPBOY_STARTUP_REPORT=path.json keeps a copy for tracking boot regressions
+    report = startup_report()
+    print("Startup report:", json.dumps(report, indent=2))
+    path = os.environ.get("PIPBOY_STARTUP_REPORT")
+    if path:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+def after_first_paint(ui):
+    """Everything that used to block the window from showing runs here, after frame one."""
+    STARTUP["first_paint_ms"] = (time.perf_counter() - _T0) * 1000
+    print(f"First paint after {STARTUP['first_paint_ms']:.0f} ms")
+    weather_update_weather(ui, "Troy, New York")  # Example city name; replace with desired city
+
+    def warm():
+        # Spare interpreter for apps, sprite decoding, openai/httpx imports and the LLM
+        # connection, all off the GUI thread
+        ui.launcher.prewarm()
+        ui.sprites.preload(imgFileBase, ui.xAd(75), ui.yAd(75))
+        chatbot.load()
+        write_startup_report()
+        # The network round trip goes last so its latency never lands in (or holds up) the report
+        chatbot.warm_up(background=False)
+    threading.Thread(target=warm, name="warm-up", daemon=True).start()
 
 def main():
     app = QApplication([])
@@ -438,11 +860,12 @@ def main():
     
     ui.setupUi(MainWindow)
     ui.setup_animation(MainWindow)
-    weather_update_weather(ui, "Troy, New York")  # Example city name; replace with desired city
+    app.aboutToQuit.connect(ui.shutdown)
 
     #MainWindow.setWindowTitle("Chatbot Interface")
     #window = Ui_MainWindow()
     MainWindow.setGeometry(0, 0, 480, 320)
+    ui.first_paint_probe = FirstPaintProbe(MainWindow, lambda: after_first_paint(ui))
     MainWindow.show()
 
     sys.exit(app.exec())
@@ -450,4 +873,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file